@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.responses import JSONResponse
 
 # SQLAlchemy
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 
 # Schemas
 from app.schemas.auth import (
@@ -30,7 +30,7 @@ from app.services.auth_service import (
 
 # Utils
 from app.utils.jwt_handler import create_access_token
-from app.utils.database import get_db
+from app.utils.database import DBSession, get_db, db_scalar, pin_reads_to_primary
 
 # Config
 from app.core.config import settings
@@ -53,10 +53,10 @@ max_age = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     "/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
 async def signup(
-    data: SignupRequest, response: Response, db: Session = Depends(get_db)
+    data: SignupRequest, response: Response, db: DBSession = Depends(get_db)
 ):
     try:
-        if db.query(User).filter(User.email == data.email).first():
+        if await db_scalar(db, select(User).where(User.email == data.email)):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="User with this email already exists.",
@@ -76,8 +76,12 @@ async def signup(
             max_age=max_age,
             path="/",
         )
+        # The new user may not have reached the replica yet
+        pin_reads_to_primary(response)
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         tb = traceback.format_exc()
         return JSONResponse(
@@ -92,7 +96,7 @@ async def signup(
 
 @router.post("/signin", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def signin(
-    data: SigninRequest, response: Response, db: Session = Depends(get_db)
+    data: SigninRequest, response: Response, db: DBSession = Depends(get_db)
 ):
     try:
         user = await validate_user_credentials(data, db)
@@ -113,6 +117,8 @@ async def signin(
         )
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         tb = traceback.format_exc()
         return JSONResponse(
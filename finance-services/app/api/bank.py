@@ -2,9 +2,9 @@
 # Imports
 # ================================================
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Header, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
 
 from typing import Optional
 import logging
@@ -28,24 +28,26 @@ from app.services.bank_service import (
     create_bank_account,
     getAccount,
     getAccounts,
+    getBanks,
+    streamAccount,
 )
+from app.services.webhook_service import handle_plaid_webhook, verify_plaid_webhook
 
 # ========== Utilities ==========
-from app.utils.database import get_db
+from app.utils.database import (
+    DBSession,
+    get_db,
+    get_read_db,
+    db_scalar,
+    pin_reads_to_primary,
+)
 from app.utils.dwolla import add_funding_source
-from app.utils.plaid_client import client, encrypt_id
+from app.utils.plaid_client import async_client, encrypt_id
+from app.utils.plaid_projection import project_account
 from app.core.config import settings
 
 # ========== Plaid Models ==========
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.products import Products
-from plaid.model.country_code import CountryCode
-from plaid.model.item_public_token_exchange_request import (
-    ItemPublicTokenExchangeRequest,
-)
-from plaid.model.accounts_get_request import AccountsGetRequest
-from plaid.model.processor_token_create_request import ProcessorTokenCreateRequest
+# Imported inside the routes: the Plaid SDK is slow to import (see plaid_client)
 
 
 # ================================================
@@ -63,17 +65,29 @@ logger = logging.getLogger(__name__)
 
 @router.post("/plaid/create_link_token")
 async def create_link_token(current_user: User = Depends(authenticate_user)):
+    from plaid.model.country_code import CountryCode
+    from plaid.model.link_token_create_request import LinkTokenCreateRequest
+    from plaid.model.link_token_create_request_user import (
+        LinkTokenCreateRequestUser,
+    )
+    from plaid.model.products import Products
+
     logger.info(f"Creating link token for user ID: {current_user.id}")
     try:
+        optional_fields = {}
+        if settings.PLAID_WEBHOOK_URL:
+            optional_fields["webhook"] = settings.PLAID_WEBHOOK_URL
+
         request = LinkTokenCreateRequest(
             user=LinkTokenCreateRequestUser(str(current_user.id)),
             client_name="Personal Finance Tracker",
             products=[Products(p) for p in settings.PLAID_PRODUCT],
             country_codes=[CountryCode("US")],
             language="en",
+            **optional_fields,
         )
 
-        response = client.link_token_create(request)
+        response = await async_client.link_token_create(request)
         logger.info(f"Link token created: {response.link_token}")
         return {"link_token": response.link_token}
     except Exception as e:
@@ -84,38 +98,47 @@ async def create_link_token(current_user: User = Depends(authenticate_user)):
 @router.post("/plaid/exchange_public_token")
 async def exchange_public_token(
     payload: PublicTokenRequest,
+    response: Response,
     current_user: User = Depends(authenticate_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db),
 ):
+    from plaid.model.accounts_get_request import AccountsGetRequest
+    from plaid.model.item_public_token_exchange_request import (
+        ItemPublicTokenExchangeRequest,
+    )
+    from plaid.model.processor_token_create_request import (
+        ProcessorTokenCreateRequest,
+    )
+
     ACH_ELIGIBLE_SUBTYPES = ["checking", "savings"]
     try:
         # Exchange public token for access token
         exchange_request = ItemPublicTokenExchangeRequest(
             public_token=payload.public_token
         )
-        exchange_response = client.item_public_token_exchange(
+        exchange_response = await async_client.item_public_token_exchange(
             exchange_request
-        ).to_dict()
+        )
 
-        access_token = exchange_response["access_token"]
-        item_id = exchange_response["item_id"]
+        access_token = exchange_response.access_token
+        item_id = exchange_response.item_id
 
         # Get account info from Plaid
-        accounts_response = client.accounts_get(
+        accounts_response = await async_client.accounts_get(
             AccountsGetRequest(access_token=access_token)
-        ).to_dict()
+        )
 
-        accounts = accounts_response.get("accounts", [])
+        accounts = [project_account(account) for account in accounts_response.accounts]
         if not accounts:
             raise HTTPException(status_code=400, detail="No accounts found for user")
 
         bank_creation_messages = []
 
         for account in accounts:
-            account_id = account["account_id"]
-            account_type = account["type"]
-            account_subtype = account["subtype"]
-            bank_name = account["name"]
+            account_id = account.account_id
+            account_type = account.type
+            account_subtype = account.subtype
+            bank_name = account.name
 
             if not account_type or not account_subtype:
                 continue
@@ -131,10 +154,10 @@ async def exchange_public_token(
                     account_id=account_id,
                     processor="dwolla",
                 )
-                processor_token = client.processor_token_create(
-                    processor_request
-                ).to_dict()["processor_token"]
-                funding_source_url = add_funding_source(
+                processor_token = (
+                    await async_client.processor_token_create(processor_request)
+                ).processor_token
+                funding_source_url = await add_funding_source(
                     current_user.dwolla_customer_id,
                     processor_token,
                     bank_name,
@@ -160,6 +183,9 @@ async def exchange_public_token(
                 {"account_id": account_id, "bank_name": bank_name, **BankMessage}
             )
 
+        # The new banks may not have reached the replica yet
+        pin_reads_to_primary(response)
+
         return {
             "public_token_exchange": "complete",
             "banks_created": bank_creation_messages,
@@ -172,6 +198,16 @@ async def exchange_public_token(
         )
 
 
+@router.post("/plaid/webhook")
+async def plaid_webhook(
+    request: Request,
+    plaid_verification: Optional[str] = Header(None, alias="Plaid-Verification"),
+):
+    body = await request.body()
+    await verify_plaid_webhook(body, plaid_verification)
+    return await handle_plaid_webhook(body)
+
+
 # ================================================
 # Bank Retrieval Routes
 # ================================================
@@ -180,20 +216,20 @@ async def exchange_public_token(
 @router.get("/userBanks", response_model=BanksResponse)
 async def get_user_banks(
     current_user: User = Depends(authenticate_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_db),
 ):
-    banks = db.query(Bank).filter(Bank.user_id == current_user.id).all()
-    bank_responses = [BankResponse.model_validate(bank) for bank in banks]
-    return BanksResponse(banks=bank_responses)
+    return await getBanks(current_user, db)
 
 
 @router.get("/getBank", response_model=BankResponse)
 async def get_bank_by_shareable_id(
     shareableId: str,
     current_user: User = Depends(authenticate_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_db),
 ):
-    bank = db.query(Bank).filter(Bank.shareable_id == shareableId).first()
+    bank = await db_scalar(
+        db, select(Bank).where(Bank.shareable_id == shareableId)
+    )
     if not bank or bank.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Bank not found")
     return bank
@@ -207,7 +243,7 @@ async def get_bank_by_shareable_id(
 @router.get("/getAccounts")
 async def get_all_user_accounts(
     current_user: User = Depends(authenticate_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_db),
 ):
     return await getAccounts(current_user, db)
 
@@ -216,7 +252,7 @@ async def get_all_user_accounts(
 async def get_single_user_account(
     shareableId: str,
     current_user: User = Depends(authenticate_user),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db),
 ):
     try:
         return await getAccount(current_user, shareableId, db)
@@ -224,10 +260,32 @@ async def get_single_user_account(
         tb = traceback.format_exc()
         logger.error(f"Error fetching account: {e}")
         return JSONResponse(
-            status_code=500,
+            status_code=getattr(e, "status_code", 500),
+            content={
+                "error": str(e),
+                "type": type(e).__name__,
+                "trace": tb,
+            },
+        )
+
+
+@router.get("/getAccount/stream")
+async def stream_single_user_account(
+    shareableId: str,
+    current_user: User = Depends(authenticate_user),
+    db: DBSession = Depends(get_db),
+):
+    try:
+        lines = await streamAccount(current_user, shareableId, db)
+    except Exception as e:
+        tb = traceback.format_exc()
+        logger.error(f"Error fetching account: {e}")
+        return JSONResponse(
+            status_code=getattr(e, "status_code", 500),
             content={
                 "error": str(e),
                 "type": type(e).__name__,
                 "trace": tb,
             },
         )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -0,0 +1,35 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.config import settings
+from app.utils.metrics import collect
+
+
+def require_metrics_token(authorization: str = Header(default="")):
+    """
+    Only serve metrics to callers presenting `Authorization: Bearer
+    <METRICS_TOKEN>`. Without a configured token the route does not exist.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(require_metrics_token)],
+)
+
+
+@router.get("")
+async def get_metrics():
+    return collect()
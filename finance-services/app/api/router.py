@@ -2,8 +2,10 @@ from fastapi import APIRouter
 from .auth import router as auth_router
 from .bank import router as bank_router
 from .transaction import router as transaction_router
+from .metrics import router as metrics_router
 
 api_router = APIRouter()
 api_router.include_router(auth_router)
 api_router.include_router(bank_router)
 api_router.include_router(transaction_router)
+api_router.include_router(metrics_router)
@@ -3,17 +3,17 @@
 # ===================================================
 
 # Standard Library
-from datetime import datetime, timezone
+from datetime import date
+from typing import Literal, Optional
 
 # FastAPI
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
-
-# SQLAlchemy
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 
 # Schemas
 from app.schemas.transaction import (
+    TransactionHistoryResponse,
     TransactionParams,
     TransactionResponse,
     TransactionsResponse,
@@ -22,10 +22,25 @@ from app.schemas.transaction import (
 
 # Models
 from app.models.transactions import Transaction
+from app.models.user import User
+
+# Services
+from app.services.auth_service import authenticate_user
+from app.services.rollup_service import get_spending_summary, record_transfer
+from app.services.transaction_service import get_transaction_history
 
 # Utilities
-from app.utils.database import get_db
+from app.utils.database import (
+    DBSession,
+    get_db,
+    db_commit,
+    db_refresh,
+    db_rollback,
+    naive_utc,
+    utcnow,
+)
 from app.utils.dwolla import create_transfer
+from app.core.config import settings
 
 
 # ===================================================
@@ -49,7 +64,7 @@ async def create_transfer_endpoint(data: TransferRequest):
         data.amount,
     )
     try:
-        res = create_transfer(
+        res = await create_transfer(
             data.source_funding_source_url,
             data.destination_funding_source_url,
             data.amount,
@@ -66,7 +81,7 @@ async def create_transfer_endpoint(data: TransferRequest):
     response_model=TransactionResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_transaction(data: TransactionParams, db: Session = Depends(get_db)):
+async def create_transaction(data: TransactionParams, db: DBSession = Depends(get_db)):
     new_transaction = Transaction(
         name=data.name,
         sender_id=data.sender_id,
@@ -78,12 +93,21 @@ async def create_transaction(data: TransactionParams, db: Session = Depends(get_
         category=data.category,
         channel=data.channel,
         pending=data.pending,
-        date=data.date or datetime.now(timezone.utc),
+        date=naive_utc(data.date) if data.date else utcnow(),
     )
 
-    db.add(new_transaction)
-    db.commit()
-    db.refresh(new_transaction)
+    try:
+        db.add(new_transaction)
+        await record_transfer(new_transaction, db)
+        await db_commit(db)
+    except IntegrityError as e:
+        # Unknown user or bank IDs
+        await db_rollback(db)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid transaction: {e.orig}",
+        )
+    await db_refresh(db, new_transaction)
 
     return {
         "id": new_transaction.id,
@@ -102,3 +126,41 @@ async def create_transaction(data: TransactionParams, db: Session = Depends(get_
         ),
         "date": new_transaction.date,
     }
+
+
+@router.get("/history", response_model=TransactionHistoryResponse)
+async def transaction_history(
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        settings.HISTORY_PAGE_SIZE, ge=1, le=settings.HISTORY_MAX_PAGE_SIZE
+    ),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    shareableId: Optional[str] = None,
+    current_user: User = Depends(authenticate_user),
+    db: DBSession = Depends(get_db),
+):
+    """
+    Page through the user's transfers and Plaid transactions, newest first.
+    Pass the returned `next_cursor` back as `cursor` for the next page.
+    """
+    return await get_transaction_history(
+        current_user, db, limit, cursor, start_date, end_date, shareableId
+    )
+
+
+@router.get("/summary/{group}")
+async def spending_summary(
+    group: Literal["category", "month", "account"],
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    current_user: User = Depends(authenticate_user),
+    db: DBSession = Depends(get_db),
+):
+    """
+    The user's spending totals per category, month or account, optionally
+    limited to the months between `start_month` and `end_month`.
+    """
+    return await get_spending_summary(
+        current_user.id, group, db, start_month, end_month
+    )
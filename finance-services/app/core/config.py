@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
 
@@ -25,6 +25,17 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_SECRET: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    JWT_CACHE_SIZE: int = 4096  # verified tokens kept per process
+    # Authenticated users cached per (user, token); bounds cross-worker staleness
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # Argon2 cost of new hashes (existing hashes keep the cost they were made with)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Hashing threads per process, and operations allowed to wait before 503s
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
     
     
     # PostgreSQL
@@ -33,6 +44,23 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_DB: str
+    # Use the asyncpg engine and AsyncSession instead of psycopg2 / Session
+    DB_ASYNC: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables the timeout
+    DB_ECHO: bool = False
+    # Run `alembic upgrade head` on boot; disable when deploys migrate separately
+    DB_MIGRATE_ON_STARTUP: bool = True
+    # Optional read replica for read-only routes; unset reads from the primary
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[int] = None  # defaults to POSTGRES_PORT
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: int = 30  # reads pinned to the primary after a write
 
     # Plaid
     PLAID_CLIENT_ID: str
@@ -40,6 +68,12 @@ class Settings(BaseSettings):
     PLAID_ENV: str = "sandbox"
     PLAID_PRODUCT: List[str]
     PLAID_COUNTRY_CODE: List[str]
+    PLAID_MAX_WORKERS: int = 16
+    PLAID_WEBHOOK_URL: Optional[str] = None
+    PLAID_WEBHOOK_VERIFY: bool = True
+    PLAID_WEBHOOK_DEBOUNCE_SECONDS: int = 10
+    INSTITUTION_CACHE_SIZE: int = 1024
+    INSTITUTION_CACHE_TTL_SECONDS: int = 86400
 
     #DWOLLA
     DWOLLA_ENV: str = "sandbox"
@@ -47,6 +81,48 @@ class Settings(BaseSettings):
     DWOLLA_SECRET: str
     DWOLLA_BASE_URL: str
 
+    # Background sync
+    SYNC_ENABLED: bool = True
+    SYNC_POLL: bool = True
+    SYNC_INTERVAL_SECONDS: int = 300
+    SYNC_CONCURRENCY: int = 4
+    SYNC_JITTER: float = 0.1
+    SYNC_MAX_BACKOFF_SECONDS: int = 3600
+    SYNC_LEASE_SECONDS: int = 600  # an item claimed longer is synced again
+    SYNC_STALE_AFTER_SECONDS: int = 900
+    STREAM_BATCH_SIZE: int = 500
+    INGEST_BATCH_SIZE: int = 1000  # rows per multi-row upsert
+
+    # Transaction partitions
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_RETENTION_MONTHS: int = 84  # older months are detached, 0 keeps all
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 86400
+
+    # Transaction history pagination
+    HISTORY_PAGE_SIZE: int = 50
+    HISTORY_MAX_PAGE_SIZE: int = 200
+
+    # Balance cache
+    BALANCE_FRESHNESS_SECONDS: int = 120
+    BALANCE_MAX_STALE_SECONDS: int = 86400
+    BALANCE_CACHE_SIZE: int = 4096
+
+    # Outbound call policy (Plaid / Dwolla)
+    PLAID_RATE_PER_SECOND: float = 20
+    PLAID_BURST: float = 40
+    PLAID_ITEM_RATE_PER_SECOND: float = 2
+    PLAID_ITEM_BURST: float = 5
+    DWOLLA_RATE_PER_SECOND: float = 10
+    DWOLLA_BURST: float = 20
+    UPSTREAM_RETRY_ATTEMPTS: int = 3
+    UPSTREAM_RETRY_BASE_DELAY: float = 0.2
+    UPSTREAM_RETRY_MAX_DELAY: float = 5.0
+    UPSTREAM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Bearer token for /metrics; unset disables the route
+    METRICS_TOKEN: Optional[str] = None
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
@@ -60,6 +136,39 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_DB}"
         )
 
+    @property
+    def postgres_async_database_url(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:"
+            f"{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_HOST}:"
+            f"{self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
+
+    @property
+    def postgres_replica_database_url(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+psycopg2://{self.POSTGRES_USER}:"
+            f"{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_REPLICA_HOST}:"
+            f"{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
+
+    @property
+    def postgres_replica_async_database_url(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:"
+            f"{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_REPLICA_HOST}:"
+            f"{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}/"
+            f"{self.POSTGRES_DB}"
+        )
 
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000"]  # default
 
@@ -3,11 +3,24 @@ from contextlib import asynccontextmanager
 
 from app.api.router import api_router
 
-from app.utils.database import Base, engine
+from app.utils.database import upgrade_db
 # TODO: Remove Models
 from app.models.user import User
 from app.models.bank import Bank
 from app.models.transactions import Transaction
+from app.models.plaid import (
+    PlaidItem,
+    PlaidAccount,
+    PlaidTransaction,
+    PlaidInstitution,
+)
+from app.models.spending import SpendingRollup
+
+from app.services.institution_service import warm_institution_cache
+from app.services.partition_service import partition_maintainer
+from app.services.sync_scheduler import sync_scheduler
+from app.utils.plaid_client import async_client
+from app.utils.password_handler import password_pool
 
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
@@ -22,12 +35,21 @@ logging.basicConfig(level=logging.INFO)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
-    print("Creating database tables if they do not exist...")
-    Base.metadata.create_all(bind=engine)
-    print("Database ready!")
+    if settings.DB_MIGRATE_ON_STARTUP:
+        print("Applying database migrations...")
+        upgrade_db()
+        print("Database ready!")
+    partition_maintainer.start()
+    warm_institution_cache()
+    if settings.SYNC_ENABLED:
+        sync_scheduler.start()
     yield
     # Shutdown logic (optional)
     print("Shutting down FinPilot Core API...")
+    await sync_scheduler.stop()
+    await partition_maintainer.stop()
+    async_client.shutdown()
+    password_pool.shutdown()
 
 app = FastAPI(title="FinPilot Core API", lifespan=lifespan)
 
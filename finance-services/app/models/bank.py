@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.utils.database import Base
 from app.models.transactions import Transaction
@@ -6,10 +6,15 @@ from app.models.transactions import Transaction
 
 class Bank(Base):
     __tablename__ = "banks"
+    __table_args__ = (
+        Index("ix_banks_user_id", "user_id"),
+        Index("ix_banks_bank_id", "bank_id"),
+        Index("ix_banks_shareable_id", "shareable_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    bank_id = Column(String(100))  # Plaid bank ID
+    bank_id = Column(String(100))  # Plaid item ID
     account_id = Column(String(100))
     access_token = Column(String)  # Store encrypted in logic
     funding_source_url = Column(String(255))
@@ -0,0 +1,114 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    Float,
+    String,
+    Boolean,
+    ForeignKey,
+    Date,
+    DateTime,
+    JSON,
+    Index,
+    func,
+)
+from app.utils.database import Base
+
+
+class PlaidItem(Base):
+    """
+    A linked Plaid item (one institution login) and its transactions sync state.
+
+    Several `Bank` rows share one item through `Bank.bank_id`.
+
+    Attributes:
+        id (int): Primary key.
+        item_id (str): Plaid item ID, same value as `Bank.bank_id`.
+        user_id (int): Owner of the item.
+        institution_id (str): Plaid institution of the item.
+        cursor (str): `next_cursor` returned by the last `/transactions/sync` call.
+        transactions_synced_at (datetime): When the mirror was last brought up to date.
+        balances_synced_at (datetime): When account balances were last refreshed.
+        next_sync_at (datetime): When the background sync is next due; None
+            while it is being synced or when no sync is scheduled.
+        sync_lease_until (datetime): Set while a worker syncs the item; once
+            past, the worker is presumed dead and the item is due again.
+        sync_failures (int): Consecutive failed background syncs.
+    """
+
+    __tablename__ = "plaid_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(String(100), unique=True, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    institution_id = Column(String(100), nullable=True)
+    cursor = Column(String, nullable=True)
+    transactions_synced_at = Column(DateTime, nullable=True)
+    balances_synced_at = Column(DateTime, nullable=True)
+    next_sync_at = Column(
+        DateTime, nullable=True, server_default=func.now(), index=True
+    )
+    sync_lease_until = Column(DateTime, nullable=True, index=True)
+    sync_failures = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class PlaidAccount(Base):
+    """
+    Last known metadata and balances of a Plaid account, refreshed from `/accounts/get`.
+    """
+
+    __tablename__ = "plaid_accounts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(String(100), unique=True, nullable=False, index=True)
+    item_id = Column(String(100), nullable=False, index=True)
+    institution_id = Column(String(100))
+    name = Column(String(255))
+    official_name = Column(String(255))
+    mask = Column(String(10))
+    type = Column(String(50))
+    subtype = Column(String(50))
+    available_balance = Column(Float)
+    current_balance = Column(Float)
+
+
+class PlaidTransaction(Base):
+    """
+    Local mirror of a Plaid transaction, maintained from `/transactions/sync` deltas.
+    """
+
+    __tablename__ = "plaid_transactions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    transaction_id = Column(String(100), unique=True, nullable=False, index=True)
+    item_id = Column(String(100), nullable=False, index=True)
+    account_id = Column(String(100), nullable=False, index=True)
+    name = Column(String(255))
+    amount = Column(Float, nullable=False)
+    date = Column(Date)
+    category = Column(String(50))
+    payment_channel = Column(String(50))
+    pending = Column(Boolean, default=False)
+    image = Column(String(255))
+
+    # Serves the per-account history stream, newest first
+    __table_args__ = (
+        Index(
+            "ix_plaid_transactions_item_account_date",
+            item_id,
+            account_id,
+            date.desc(),
+            id.desc(),
+        ),
+    )
+
+class PlaidInstitution(Base):
+    """
+    Persisted copy of Plaid institution metadata, used to warm the institution cache.
+    """
+
+    __tablename__ = "plaid_institutions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    institution_id = Column(String(100), unique=True, nullable=False, index=True)
+    data = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
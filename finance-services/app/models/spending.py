@@ -0,0 +1,49 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    Float,
+    String,
+    ForeignKey,
+    Date,
+    UniqueConstraint,
+)
+from app.utils.database import Base
+
+
+class SpendingRollup(Base):
+    """
+    Running spending totals of a user per (month, category, account).
+
+    Maintained incrementally as transactions are created and Plaid deltas are
+    applied, so summaries never scan the transactions themselves.
+
+    Attributes:
+        id (int): Primary key.
+        user_id (int): Owner of the spending.
+        month (date): First day of the month.
+        category (str): Transaction category, "" when uncategorized.
+        account_id (str): Plaid account ID of the bank account.
+        total (float): Net outflow; money in (e.g. received transfers) counts negative.
+        count (int): Number of transactions in the bucket.
+    """
+
+    __tablename__ = "spending_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "month",
+            "category",
+            "account_id",
+            name="uq_spending_rollups_user_month_category_account",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    month = Column(Date, nullable=False)
+    category = Column(String(50), nullable=False, default="")
+    account_id = Column(String(100), nullable=False)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
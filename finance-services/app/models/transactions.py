@@ -1,26 +1,44 @@
-from sqlalchemy import Column, Integer, Float, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    Float,
+    String,
+    Boolean,
+    ForeignKey,
+    DateTime,
+    Index,
+)
 from sqlalchemy.orm import relationship
-from datetime import datetime, timezone
-from app.utils.database import Base
+from app.utils.database import Base, utcnow
 
 
 #  TODO: refine the model: add email field later
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String(50))
     sender_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     receiver_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     sender_bank_id = Column(Integer, ForeignKey("banks.id", ondelete="CASCADE"))
     receiver_bank_id = Column(Integer, ForeignKey("banks.id", ondelete="CASCADE"))
     amount = Column(Float, nullable=False)
-    date = Column(DateTime, default=datetime.now(timezone.utc))
+    # Part of the primary key: the table is range partitioned by month on it
+    date = Column(DateTime, primary_key=True, default=utcnow)
     type = Column(String(50))
     category = Column(String(50))
     channel = Column(String(50))
     pending = Column(Boolean, default=True)
 
+    # One index per side of a transfer, ordered like the history reads
+    __table_args__ = (
+        Index("ix_transactions_sender_id_date", sender_id, date.desc()),
+        Index("ix_transactions_receiver_id_date", receiver_id, date.desc()),
+        Index("ix_transactions_sender_bank_id_date", sender_bank_id, date.desc()),
+        Index("ix_transactions_receiver_bank_id_date", receiver_bank_id, date.desc()),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
     sender = relationship(
         "User", foreign_keys=[sender_id], back_populates="sent_transactions"
     )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional
 from app.models.user import User
 from typing import List
@@ -26,6 +26,10 @@ class BanksResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# Validates a whole list of rows in one pass
+BankResponseList = TypeAdapter(List[BankResponse])
+
+
 class CreateBankAccountRequest(BaseModel):
     user_id: str
     bank_id: str
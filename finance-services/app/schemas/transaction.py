@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
+from typing import Optional, Union
+from datetime import date, datetime
 from typing import List
 
 
@@ -38,6 +38,7 @@ class TransactionResponse(BaseModel):
     pending: Optional[bool] = False
     sender_bank_id: Optional[int] = None
     receiver_bank_id: Optional[int] = None
+    direction: Optional[str] = None  # "debit" or "credit", from the ledger
 
     model_config = {"from_attributes": True}
 
@@ -48,6 +49,10 @@ class TransactionsResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# Validates a whole list of rows in one pass
+TransactionResponseList = TypeAdapter(List[TransactionResponse])
+
+
 class CreateBankAccountRequest(BaseModel):
     user_id: str
     bank_id: str
@@ -68,3 +73,22 @@ class CreateBankAccountRequest(BaseModel):
                 "shareableId": "abc-def-ghi",
             }
         }
+
+
+class HistoryEntry(BaseModel):
+    id: Union[int, str]
+    source: str  # "transfer" or "plaid"
+    name: Optional[str] = None
+    amount: float
+    date: date
+    type: Optional[str] = None
+    category: Optional[str] = None
+    payment_channel: Optional[str] = None
+    account_id: Optional[str] = None
+    pending: Optional[bool] = None
+    image: Optional[str] = None
+
+
+class TransactionHistoryResponse(BaseModel):
+    transactions: List[HistoryEntry]
+    next_cursor: Optional[str] = None
@@ -2,35 +2,122 @@
 # Imports
 # ===================================================
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
-from argon2 import PasswordHasher
 from cryptography.fernet import Fernet
 from datetime import date, datetime
 
-from app.utils.jwt_handler import verify_token
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.jwt_handler import token_digest, verify_token
 from app.models.user import User
 from app.schemas.auth import UserResponse, SignupRequest, SigninRequest
-from app.utils.database import get_db
+from app.utils.database import (
+    DBSession,
+    read_session_scope,
+    db_commit,
+    db_delete,
+    db_refresh,
+    db_rollback,
+    db_scalar,
+)
 from app.utils.dwolla import create_dwolla_customer, extractCustomerIdFromUrl
+from app.utils.metrics import register_collector
+from app.utils.password_handler import PasswordHasherBusy, password_pool
 
 # ===================================================
 # Initialization
 # ===================================================
 
-ph = PasswordHasher()
 key = Fernet.generate_key()  # In production, load from secure vault
 cipher = Fernet(key)
 
+# ===================================================
+# Principal Cache
+# ===================================================
+
+# Authenticated users, keyed by (user id, sha256 of the token), so repeated
+# requests with the same cookie skip the user lookup. Entries are dropped when
+# the user row is updated or deleted through the ORM in this process; other
+# workers see the change once their entry expires.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+_principal_invalidations = 0
+
+
+def _principal_key(user_id: int, token: str) -> tuple:
+    return (user_id, token_digest(token))
+
+
+def invalidate_principal(user_id: int):
+    """
+    Drop the cached principals of a user, for every token they hold.
+    """
+    global _principal_invalidations
+    for key in principal_cache.keys():
+        if key[0] == user_id:
+            principal_cache.invalidate(key)
+            _principal_invalidations += 1
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_user_change(mapper, connection, target: User):
+    # Invalidate now and again after commit: a request racing the flush could
+    # otherwise cache the row as it was before the commit
+    invalidate_principal(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back_users(session: Session, previous_transaction):
+    session.info.pop("changed_user_ids", None)
+
+
+def principal_cache_stats() -> dict:
+    return {
+        "hits": principal_cache.hits,
+        "misses": principal_cache.misses,
+        "invalidations": _principal_invalidations,
+        "size": len(principal_cache),
+    }
+
+
+register_collector("principal_cache", principal_cache_stats)
+
+def _password_hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 # ===================================================
 # Function: authenticate_user
 # ===================================================
 
 
-async def authenticate_user(request: Request, db: Session = Depends(get_db)):
+async def authenticate_user(request: Request):
     """
     Authenticate the user by verifying the JWT token stored in the request cookies.
+    The user is read from the principal cache when this token was seen recently.
+
+    On a cache miss the user is read on a session of its own, closed before the
+    route runs, so authentication never holds a second connection alongside
+    the route's session for the whole request.
     """
     token = request.cookies.get("jwt")
 
@@ -47,15 +134,22 @@ async def authenticate_user(request: Request, db: Session = Depends(get_db)):
             detail="Access denied: Token invalid or expired.",
         )
 
-    user_id = payload.get("user_id")
-    if user_id is None:
+    try:
+        user_id = int(payload["user_id"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload.",
         )
 
+    key = _principal_key(user_id, token)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
+
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        async with read_session_scope(request) as db:
+            user = await db_scalar(db, select(User).where(User.id == user_id))
     except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,7 +167,9 @@ async def authenticate_user(request: Request, db: Session = Depends(get_db)):
             detail="User not found.",
         )
 
-    return user
+    principal = UserResponse.model_validate(user)
+    principal_cache.set(key, principal)
+    return principal
 
 
 # ===================================================
@@ -81,13 +177,16 @@ async def authenticate_user(request: Request, db: Session = Depends(get_db)):
 # ===================================================
 
 
-async def register_user(user: SignupRequest, db: Session) -> UserResponse:
+async def register_user(user: SignupRequest, db: DBSession) -> UserResponse:
     """
     Register a new user by securely processing sensitive fields, saving the user to the database,
     and creating a corresponding Dwolla customer.
     """
 
-    hashed_password = ph.hash(user.password)
+    try:
+        hashed_password = await password_pool.hash(user.password)
+    except PasswordHasherBusy:
+        raise _password_hashing_busy()
     encrypted_ssn = cipher.encrypt(user.ssn.encode()).decode() if user.ssn else None
 
     db_user = User(
@@ -102,12 +201,14 @@ async def register_user(user: SignupRequest, db: Session) -> UserResponse:
         postal_code=user.postal_code,
         date_of_birth=user.date_of_birth,
     )
-    print(f"user.address1==>{user.address1}")
-    print(f"db_user.address1==>{db_user.address1}")
+    # Set once the user row is committed; read before any rollback, which
+    # expires `db_user` (and lazy loads are not allowed under AsyncSession)
+    user_id = None
     try:
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db_commit(db)
+        await db_refresh(db, db_user)
+        user_id = db_user.id
 
         dwolla_payload = {
             "firstName": db_user.first_name,
@@ -131,17 +232,17 @@ async def register_user(user: SignupRequest, db: Session) -> UserResponse:
 
         db_user.dwolla_customer_url = dwollaCustomerUrl
         db_user.dwolla_customer_id = dwollaCustomerId
-        db.commit()
+        await db_commit(db)
 
     except Exception as e:
-        db.rollback()
+        await db_rollback(db)
 
-        if db_user.id:
+        if user_id is not None:
             try:
-                db.delete(db_user)
-                db.commit()
+                await db_delete(db, db_user)
+                await db_commit(db)
             except SQLAlchemyError as delete_error:
-                db.rollback()
+                await db_rollback(db)
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Dwolla failed and user delete also failed: {delete_error}",
@@ -160,20 +261,20 @@ async def register_user(user: SignupRequest, db: Session) -> UserResponse:
 # ===================================================
 
 
-async def validate_user_credentials(data: SigninRequest, db: Session) -> UserResponse:
+async def validate_user_credentials(data: SigninRequest, db: DBSession) -> UserResponse:
     """
     Validate user credentials by verifying the email and password against stored data.
     """
     try:
-        user = db.query(User).filter(User.email == data.email).first()
+        user = await db_scalar(db, select(User).where(User.email == data.email))
     except SQLAlchemyError:
-        db.rollback()
+        await db_rollback(db)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving user.",
         )
     except Exception as e:
-        db.rollback()
+        await db_rollback(db)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error occurred: {e}",
@@ -186,8 +287,13 @@ async def validate_user_credentials(data: SigninRequest, db: Session) -> UserRes
         )
 
     try:
-        ph.verify(user.hashed_password, data.password)
+        verified = await password_pool.verify(user.hashed_password, data.password)
+    except PasswordHasherBusy:
+        raise _password_hashing_busy()
     except Exception:
+        verified = False
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email or password.",
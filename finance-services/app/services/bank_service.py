@@ -2,56 +2,300 @@
 # IMPORTS
 # =====================================
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy import select
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 import asyncio
-
-# Plaid
-from plaid.model.accounts_get_request import AccountsGetRequest
-from plaid.model.institutions_get_by_id_request import InstitutionsGetByIdRequest
-from plaid.model.country_code import CountryCode
+import heapq
+import json
+import logging
 
 # App - Utils
-from app.utils.plaid_client import client, encrypt_id, decrypt_id
-from app.utils.database import get_db
+from app.utils.plaid_client import async_client, encrypt_id, decrypt_id
+from app.utils.database import (
+    DBSession,
+    SessionLocal,
+    get_db,
+    db_commit,
+    db_execute,
+    db_refresh,
+    db_rollback,
+    db_scalar,
+    db_scalars,
+    row_dicts,
+    session_scope,
+    utcnow,
+)
+from app.utils.cache import TTLCache
+from app.utils.singleflight import plaid_flight
+from app.utils.plaid_projection import project_account
+from app.utils.resilience import UpstreamUnavailable
+from app.core.config import settings
 
 # App - Services
 from app.services.auth_service import authenticate_user
-from app.services.transaction_service import get_transactions, get_transactions_by_bank
+from app.services.institution_service import get_institution
+from app.services.transaction_service import (
+    get_or_create_item,
+    get_account_transactions,
+    get_transactions_by_bank,
+    is_recently_synced,
+    iter_account_transactions,
+    iter_transactions_by_bank,
+    schedule_item_sync,
+    sync_transactions,
+)
 
 # App - Models
 from app.models.user import User
 from app.models.bank import Bank
+from app.models.plaid import PlaidItem, PlaidAccount
 
 # App - Schemas
 from app.schemas.bank import (
     CreateBankAccountRequest,
     BankResponse,
+    BankResponseList,
     BanksResponse,
 )
 
+logger = logging.getLogger(__name__)
+
 # =====================================
 # HELPERS
 # =====================================
 
 
-def get_institution(institution_id: str):
+def _mirror_account_fields(accountData: PlaidAccount) -> dict:
+    return {
+        "account_id": accountData.account_id,
+        "available_balance": accountData.available_balance,
+        "current_balance": accountData.current_balance,
+        "institution_id": accountData.institution_id,
+        "name": accountData.name,
+        "official_name": accountData.official_name,
+        "mask": accountData.mask,
+        "type": accountData.type,
+        "subtype": accountData.subtype,
+    }
+
+
+def _account_payload(accountData: dict, bank: Bank) -> dict:
     """
-    Fetch institution details from Plaid API using institution ID.
+    Shape a mirrored Plaid account the way the account endpoints return it.
     """
-    try:
-        institution_response = client.institutions_get_by_id(
-            InstitutionsGetByIdRequest(
-                institution_id=institution_id,
-                country_codes=[CountryCode("US")],
+    return {
+        "id": accountData["account_id"],
+        "available_balance": accountData["available_balance"],
+        "current_balance": accountData["current_balance"],
+        "institution_id": accountData["institution_id"],
+        "name": accountData["name"],
+        "official_name": accountData["official_name"],
+        "mask": accountData["mask"],
+        "type": accountData["type"],
+        "subtype": accountData["subtype"],
+        "bank_id": bank.id,
+        "shareable_id": bank.shareable_id,
+    }
+
+
+def _age_seconds(timestamp: datetime) -> float:
+    return (datetime.now(timezone.utc) - timestamp).total_seconds()
+
+
+# =====================================
+# BALANCE CACHE
+# =====================================
+
+# Per-item balances, served stale-while-revalidate: entries younger than
+# BALANCE_FRESHNESS_SECONDS are returned as is, older ones are returned right
+# away while a background refresh runs, and entries past
+# BALANCE_MAX_STALE_SECONDS are dropped so the next request waits for Plaid.
+balance_cache = TTLCache(
+    maxsize=settings.BALANCE_CACHE_SIZE,
+    ttl=settings.BALANCE_MAX_STALE_SECONDS,
+)
+_balance_refreshes: Dict[str, asyncio.Task] = {}
+
+
+def _cache_balances(item_id: str, accounts: List[dict], as_of: datetime):
+    if as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+
+    entry = {"accounts": accounts, "as_of": as_of}
+    ttl = settings.BALANCE_MAX_STALE_SECONDS - _age_seconds(as_of)
+    if ttl > 0:
+        balance_cache.set(item_id, entry, ttl=ttl)
+    return entry
+
+
+async def _load_cached_balances(
+    bank: Bank, db: DBSession, allow_expired: bool = False
+) -> Optional[dict]:
+    """
+    Return the cached balances of the bank's item, falling back to the mirror
+    tables when this worker has not cached them yet. Balances older than
+    BALANCE_MAX_STALE_SECONDS are only returned with `allow_expired`.
+    """
+    entry = balance_cache.get(bank.bank_id)
+    if entry is not None:
+        return entry
+
+    item = await db_scalar(
+        db, select(PlaidItem).where(PlaidItem.item_id == bank.bank_id)
+    )
+    if not item or not item.balances_synced_at:
+        return None
+
+    rows = await db_scalars(
+        db, select(PlaidAccount).where(PlaidAccount.item_id == item.item_id)
+    )
+    entry = _cache_balances(
+        item.item_id,
+        [_mirror_account_fields(row) for row in rows],
+        item.balances_synced_at,
+    )
+    age = _age_seconds(entry["as_of"])
+    if allow_expired or age < settings.BALANCE_MAX_STALE_SECONDS:
+        return entry
+    return None
+
+
+async def _fallback_balances(bank: Bank, error: Exception, db: DBSession) -> dict:
+    """
+    Serve the last mirrored balances, however old, when Plaid cannot be
+    reached; re-raise `error` if there is nothing to serve.
+    """
+    entry = await _load_cached_balances(bank, db, allow_expired=True)
+    if entry is None:
+        raise error
+    logger.warning(
+        f"Serving cached balances for {bank.bank_id}, upstream failed: {error}"
+    )
+    return entry
+
+
+def _revalidate_in_background(bank: Bank):
+    """
+    Start a background balance refresh for the bank's item unless one is running.
+    """
+    item_id, user_id, access_token = bank.bank_id, bank.user_id, bank.access_token
+    if item_id in _balance_refreshes:
+        return
+
+    # The task outlives the request session `bank` is bound to, so it only
+    # uses the copies above
+    async def refresh():
+        async with session_scope() as db:
+            try:
+                await sync_balances(decrypt_id(access_token), item_id, user_id, db)
+            except Exception as e:
+                logger.warning(f"Background balance refresh failed for {item_id}: {e}")
+
+    task = asyncio.create_task(refresh())
+    _balance_refreshes[item_id] = task
+    task.add_done_callback(lambda _: _balance_refreshes.pop(item_id, None))
+
+
+async def get_item_balances(bank: Bank, db: DBSession) -> dict:
+    """
+    Return `{"accounts": [...], "as_of": datetime}` for the bank's item.
+    """
+    entry = await _load_cached_balances(bank, db)
+    if entry is None:
+        item = await get_or_create_item(bank.bank_id, bank.user_id, db)
+        try:
+            balances = await fetch_balances(
+                decrypt_id(bank.access_token), bank.bank_id
             )
+        except Exception as e:
+            return await _fallback_balances(bank, e, db)
+        return await store_balances(item, balances, db)
+
+    if _age_seconds(entry["as_of"]) >= settings.BALANCE_FRESHNESS_SECONDS:
+        _revalidate_in_background(bank)
+    return entry
+
+
+# =====================================
+# BALANCE SYNC
+# =====================================
+
+
+async def fetch_balances(access_token: str, item_id: str):
+    """
+    Fetch the accounts and balances of a Plaid item along with its institution.
+
+    Concurrent fetches for the same item share one `/accounts/get` call.
+    """
+    from plaid.model.accounts_get_request import AccountsGetRequest
+
+    accountsResponse = await plaid_flight.do(
+        ("accounts_get", item_id),
+        lambda: async_client.accounts_get(
+            AccountsGetRequest(access_token=access_token)
+        ),
+    )
+    institution = await get_institution(accountsResponse.item.institution_id)
+    return accountsResponse, institution
+
+
+async def store_balances(item: PlaidItem, balances, db: DBSession) -> dict:
+    """
+    Save a `fetch_balances` result into the account mirror of the item and the
+    balance cache. Returns the new cache entry.
+    """
+    accountsResponse, institution = balances
+    item.institution_id = institution["institution_id"]
+
+    existing = {
+        row.account_id: row
+        for row in await db_scalars(
+            db, select(PlaidAccount).where(PlaidAccount.item_id == item.item_id)
         )
-        return institution_response.institution
+    }
+
+    accounts = []
+    for accountData in map(project_account, accountsResponse.accounts):
+        row = existing.get(accountData.account_id)
+        if not row:
+            row = PlaidAccount(account_id=accountData.account_id, item_id=item.item_id)
+            db.add(row)
+
+        row.institution_id = institution["institution_id"]
+        row.name = accountData.name
+        row.official_name = accountData.official_name
+        row.mask = accountData.mask
+        row.type = accountData.type
+        row.subtype = accountData.subtype
+        row.available_balance = accountData.available_balance
+        row.current_balance = accountData.current_balance
+        accounts.append(_mirror_account_fields(row))
+
+    item.balances_synced_at = utcnow()
+    await db_commit(db)
+
+    return _cache_balances(item.item_id, accounts, item.balances_synced_at)
+
+
+async def sync_balances(
+    access_token: str, item_id: str, user_id: int, db: DBSession
+):
+    """
+    Refresh the mirrored balances of a Plaid item from upstream.
+    """
+    try:
+        item = await get_or_create_item(item_id, user_id, db)
+        await store_balances(item, await fetch_balances(access_token, item_id), db)
+        return item
+
+    except UpstreamUnavailable:
+        await db_rollback(db)
+        raise
     except Exception as e:
-        print("Error getting institution:", e)
-        raise HTTPException(
-            status_code=500, detail=f"Could not fetch institution info: {e}"
-        )
+        await db_rollback(db)
+        logger.error(f"Error syncing balances for {item_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Could not sync balances: {e}")
 
 
 # =====================================
@@ -59,43 +303,89 @@ def get_institution(institution_id: str):
 # =====================================
 
 
-async def getBank(shareableId: str, db: Session):
-    bank = db.query(Bank).filter(Bank.shareable_id == shareableId).first()
+async def getBank(shareableId: str, db: DBSession):
+    bank = await db_scalar(db, select(Bank).where(Bank.shareable_id == shareableId))
     if not bank:
         raise HTTPException(status_code=404, detail="Bank not found")
     return bank
 
 
-async def getBanks(current_user: User, db: Session):
-    banks = db.query(Bank).filter(Bank.user_id == current_user.id).all()
-    bank_responses = [BankResponse.model_validate(bank) for bank in banks]
-    return BanksResponse(banks=bank_responses)
+# Only the columns `BankResponse` needs, read as plain rows
+BANK_RESPONSE_COLUMNS = [
+    getattr(Bank, name) for name in BankResponse.model_fields
+]
 
 
-async def getAccount(current_user: User, shareableId: str, db: Session):
-    try:
-        bank = await getBank(shareableId, db)
-        decrypted_token = decrypt_id(bank.access_token)
-        accountsResponse = client.accounts_get({"access_token": decrypted_token})
+async def getBanks(current_user: User, db: DBSession):
+    banks = await db_execute(
+        db, select(*BANK_RESPONSE_COLUMNS).where(Bank.user_id == current_user.id)
+    )
+    return BanksResponse(banks=BankResponseList.validate_python(row_dicts(banks)))
 
-        target_account_id = bank.account_id
 
-        accountData = next(
-            (
-                acct
-                for acct in accountsResponse["accounts"]
-                if acct["account_id"] == target_account_id
-            ),
-            None,
-        )
+async def _load_account(shareableId: str, db: DBSession):
+    """
+    Resolve a bank by shareable ID together with its item, balances and account
+    metadata, syncing the transaction mirror first if it has gone stale.
+    """
+    bank = await getBank(shareableId, db)
+    balances = await get_item_balances(bank, db)
+
+    # Serve what the background sync stored unless it has gone stale
+    item = await get_or_create_item(bank.bank_id, bank.user_id, db)
+    last_synced_at = item.transactions_synced_at
+    if not is_recently_synced(last_synced_at):
+        try:
+            await sync_transactions(
+                decrypt_id(bank.access_token), bank.bank_id, bank.user_id, db
+            )
+        except Exception as e:
+            # Fall back to the mirror as last synced while upstream is degraded
+            if last_synced_at is None:
+                raise
+            # The failed sync rolled back, expiring both; reload them rather
+            # than lazy load on access, which an AsyncSession cannot do
+            await db_refresh(db, bank)
+            await db_refresh(db, item)
+            logger.warning(f"Serving mirrored transactions for {bank.bank_id}: {e}")
+
+    accountData = next(
+        (
+            acct
+            for acct in balances["accounts"]
+            if acct["account_id"] == bank.account_id
+        ),
+        None,
+    )
+
+    if not accountData:
+        raise HTTPException(status_code=404, detail="Account data not found")
+
+    return bank, item, balances, _account_payload(accountData, bank)
 
-        if not accountData:
-            raise HTTPException(status_code=404, detail="Account data not found")
 
-        institution = get_institution(accountsResponse["item"]["institution_id"])
+def _transfer_payload(tx) -> dict:
+    return {
+        "id": tx.id,
+        "name": tx.name,
+        "amount": tx.amount,
+        "date": tx.date.date(),
+        "payment_channel": "internal",
+        "category": tx.category,
+        "type": tx.direction,
+    }
+
 
-        transactions_response = await get_transactions(
-            decrypted_token, target_account_id
+def _ndjson_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+async def getAccount(current_user: User, shareableId: str, db: DBSession):
+    try:
+        bank, item, balances, account = await _load_account(shareableId, db)
+
+        transactions_response = await get_account_transactions(
+            bank.bank_id, bank.account_id, db
         )
 
         transfer_transactions_raw = await get_transactions_by_bank(
@@ -103,37 +393,20 @@ async def getAccount(current_user: User, shareableId: str, db: Session):
         )
 
         transfer_transactions = [
-            {
-                "id": tx.id,
-                "name": tx.name,
-                "amount": tx.amount,
-                "date": tx.date.date(),
-                "payment_channel": "internal",
-                "category": tx.category,
-                "type": "debit" if tx.sender_bank_id == bank.id else "credit",
-            }
-            for tx in transfer_transactions_raw
+            _transfer_payload(tx) for tx in transfer_transactions_raw
         ]
 
-        account = {
-            "id": accountData.account_id,
-            "available_balance": accountData.balances.available,
-            "current_balance": accountData.balances.current,
-            "institution_id": institution.institution_id,
-            "name": accountData.name,
-            "official_name": accountData.official_name,
-            "mask": accountData.mask,
-            "type": str(accountData.type),
-            "subtype": str(accountData.subtype),
-            "bank_id": bank.id,
-            "shareable_id": bank.shareable_id,
-        }
-
         all_transactions = transactions_response + transfer_transactions
         all_transactions.sort(key=lambda tx: tx["date"], reverse=True)
 
-        return {"data": account, "transactions": all_transactions}
+        return {
+            "data": account,
+            "transactions": all_transactions,
+            "as_of": balances["as_of"],
+        }
 
+    except UpstreamUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Upstream unavailable: {e}")
     except Exception as e:
         print(f"Error getting account: {e}")
         raise HTTPException(
@@ -141,48 +414,100 @@ async def getAccount(current_user: User, shareableId: str, db: Session):
         )
 
 
-async def getAccounts(current_user: User, db: Session):
+async def streamAccount(current_user: User, shareableId: str, db: DBSession):
+    """
+    Streaming variant of `getAccount`.
+
+    Returns an iterator of NDJSON lines: the account metadata first, then the
+    account's Plaid and internal transactions merged newest first. Both sources
+    are read in batches on a dedicated session, so memory stays flat whatever
+    the length of the history.
+    """
+    try:
+        bank, item, balances, account = await _load_account(shareableId, db)
+    except UpstreamUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Upstream unavailable: {e}")
+    except Exception as e:
+        print(f"Error getting account: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Could not fetch account data : {e}"
+        )
+
+    user_id, bank_id, account_id = current_user.id, bank.id, bank.account_id
+    item_id = item.item_id
+
+    def lines():
+        yield json.dumps(
+            {"data": account, "as_of": balances["as_of"]}, default=_ndjson_default
+        ) + "\n"
+
+        # The request session is closed once the response starts streaming
+        stream_db = SessionLocal()
+        try:
+            transfers = (
+                _transfer_payload(tx)
+                for tx in iter_transactions_by_bank(user_id, bank_id, stream_db)
+            )
+            for tx in heapq.merge(
+                iter_account_transactions(item_id, account_id, stream_db),
+                transfers,
+                key=lambda tx: tx["date"],
+                reverse=True,
+            ):
+                yield json.dumps(tx, default=_ndjson_default) + "\n"
+        finally:
+            stream_db.close()
+
+    return lines()
+
+
+async def getAccounts(current_user: User, db: DBSession):
     try:
         banks_response = await getBanks(current_user, db)
         banks = banks_response.banks
         banks_by_account_id = {b.account_id: b for b in banks}
 
-        accounts = []
-
-        async def process_bank(bank):
-            decrypted_token = decrypt_id(bank.access_token)
-            accountsResponse = client.accounts_get({"access_token": decrypted_token})
-
-            for accountData in accountsResponse["accounts"]:
-                matching_bank = banks_by_account_id.get(accountData.account_id)
-                if not matching_bank:
-                    continue
-
-                institution = get_institution(
-                    accountsResponse["item"]["institution_id"]
-                )
-
-                account = {
-                    "id": accountData.account_id,
-                    "available_balance": accountData.balances.available,
-                    "current_balance": accountData.balances.current,
-                    "institution_id": institution.institution_id,
-                    "name": accountData.name,
-                    "official_name": accountData.official_name,
-                    "mask": accountData.mask,
-                    "type": str(accountData.type),
-                    "subtype": str(accountData.subtype),
-                    "bank_id": matching_bank.id,
-                    "shareable_id": matching_bank.shareable_id,
-                }
-                accounts.append(account)
-
-        await asyncio.gather(
+        # Cached items are answered immediately (stale ones revalidate in the
+        # background); only items with nothing cached wait on Plaid.
+        entries = []
+        missing = []
+        for bank in {b.bank_id: b for b in banks or []}.values():
+            entry = await _load_cached_balances(bank, db)
+            if entry is None:
+                missing.append(bank)
+                continue
+            if _age_seconds(entry["as_of"]) >= settings.BALANCE_FRESHNESS_SECONDS:
+                _revalidate_in_background(bank)
+            entries.append(entry)
+
+        responses = await asyncio.gather(
             *(
-                process_bank(bank)
-                for bank in {b.bank_id: b for b in banks or []}.values()
-            )
+                fetch_balances(decrypt_id(bank.access_token), bank.bank_id)
+                for bank in missing
+            ),
+            return_exceptions=True,
         )
+        if missing:
+            # `db` may be a read replica session, so fetched balances are
+            # stored through the primary
+            async with session_scope() as primary:
+                for bank, balances in zip(missing, responses):
+                    if isinstance(balances, Exception):
+                        entries.append(await _fallback_balances(bank, balances, db))
+                        continue
+                    item = await get_or_create_item(
+                        bank.bank_id, bank.user_id, primary
+                    )
+                    entries.append(await store_balances(item, balances, primary))
+
+        accounts = [
+            _account_payload(
+                accountData, banks_by_account_id[accountData["account_id"]]
+            )
+            for entry in entries
+            for accountData in entry["accounts"]
+            if accountData["account_id"] in banks_by_account_id
+        ]
 
         totalBanks = len(accounts)
         totalCurrentBalance = sum(
@@ -193,15 +518,22 @@ async def getAccounts(current_user: User, db: Session):
             "accounts": accounts,
             "total_banks": totalBanks,
             "total_current_balance": totalCurrentBalance,
+            "as_of": (
+                min(entry["as_of"] for entry in entries)
+                if entries
+                else datetime.now(timezone.utc)
+            ),
         }
 
+    except UpstreamUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Upstream unavailable: {e}")
     except Exception as e:
         print("Error getting Accounts:", e)
         raise HTTPException(status_code=500, detail=f"Could not get Accounts : {e}")
 
 
 async def create_bank_account(
-    request: CreateBankAccountRequest, currentuser: User, db: Session
+    request: CreateBankAccountRequest, currentuser: User, db: DBSession
 ):
     if not currentuser:
         raise HTTPException(status_code=404, detail="User not found")
@@ -218,8 +550,11 @@ async def create_bank_account(
     )
 
     db.add(new_bank_account)
-    db.commit()
-    db.refresh(new_bank_account)
+    # Have the background sync pick the item up right away
+    await get_or_create_item(request["bank_id"], request["user_id"], db)
+    await schedule_item_sync(request["bank_id"], 0, db)
+    await db_commit(db)
+    await db_refresh(db, new_bank_account)
 
     return {
         "bank_account": {
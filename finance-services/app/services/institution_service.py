@@ -0,0 +1,173 @@
+# ================================================
+# Imports
+# ================================================
+
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.plaid import PlaidInstitution
+from app.utils.cache import TTLCache
+from app.utils.database import (
+    SessionLocal,
+    db_commit,
+    db_rollback,
+    db_scalar,
+    session_scope,
+    utcnow,
+)
+from app.utils.plaid_client import async_client
+from app.utils.resilience import UpstreamUnavailable
+from app.utils.singleflight import plaid_flight
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================
+# Institution Cache
+# ================================================
+
+# Institution metadata barely changes, so it is cached in memory and persisted
+# to `plaid_institutions` so that a freshly started worker begins warm.
+institution_cache = TTLCache(
+    maxsize=settings.INSTITUTION_CACHE_SIZE,
+    ttl=settings.INSTITUTION_CACHE_TTL_SECONDS,
+)
+
+
+def _remaining_ttl(fetched_at: datetime) -> float:
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+    return settings.INSTITUTION_CACHE_TTL_SECONDS - age
+
+
+def _institution_fields(institution) -> dict:
+    """
+    Keep the JSON-serialisable institution fields we care about.
+    """
+    return {
+        "institution_id": institution.institution_id,
+        "name": institution.name,
+        "url": institution.get("url"),
+        "logo": institution.get("logo"),
+        "primary_color": institution.get("primary_color"),
+        "products": [str(product) for product in institution.products],
+        "country_codes": [str(code) for code in institution.country_codes],
+        "oauth": institution.oauth,
+    }
+
+
+def _select_institution(institution_id: str):
+    return select(PlaidInstitution).where(
+        PlaidInstitution.institution_id == institution_id
+    )
+
+
+async def _load_persisted(institution_id: str) -> Optional[dict]:
+    async with session_scope() as db:
+        row = await db_scalar(db, _select_institution(institution_id))
+        if not row:
+            return None
+
+        ttl = _remaining_ttl(row.fetched_at)
+        if ttl <= 0:
+            return None
+
+        institution_cache.set(institution_id, row.data, ttl=ttl)
+        return row.data
+
+
+async def _persist(institution_id: str, data: dict):
+    async with session_scope() as db:
+        try:
+            row = await db_scalar(db, _select_institution(institution_id))
+            if not row:
+                row = PlaidInstitution(institution_id=institution_id)
+                db.add(row)
+            row.data = data
+            row.fetched_at = utcnow()
+            await db_commit(db)
+        except Exception as e:
+            await db_rollback(db)
+            logger.warning(f"Could not persist institution {institution_id}: {e}")
+
+
+async def _fetch_institution(institution_id: str) -> dict:
+    persisted = await _load_persisted(institution_id)
+    if persisted is not None:
+        return persisted
+
+    from plaid.model.country_code import CountryCode
+    from plaid.model.institutions_get_by_id_request import (
+        InstitutionsGetByIdRequest,
+    )
+
+    institution_response = await async_client.institutions_get_by_id(
+        InstitutionsGetByIdRequest(
+            institution_id=institution_id,
+            country_codes=[CountryCode("US")],
+        )
+    )
+    data = _institution_fields(institution_response.institution)
+
+    await _persist(institution_id, data)
+    institution_cache.set(institution_id, data)
+    return data
+
+
+async def get_institution(institution_id: str) -> dict:
+    """
+    Return institution details for `institution_id`.
+
+    Served from the TTL cache when possible. On a miss the persisted copy is
+    tried before Plaid, and concurrent misses for the same institution share a
+    single lookup.
+    """
+    data = institution_cache.get(institution_id)
+    if data is not None:
+        return data
+
+    try:
+        return await plaid_flight.do(
+            ("institutions_get_by_id", institution_id),
+            lambda: _fetch_institution(institution_id),
+        )
+    except UpstreamUnavailable:
+        raise
+    except Exception as e:
+        print("Error getting institution:", e)
+        raise HTTPException(
+            status_code=500, detail=f"Could not fetch institution info: {e}"
+        )
+
+
+def warm_institution_cache():
+    """
+    Load the most recently fetched, unexpired institutions into memory.
+    """
+    cutoff = utcnow() - timedelta(
+        seconds=settings.INSTITUTION_CACHE_TTL_SECONDS
+    )
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(PlaidInstitution)
+            .filter(PlaidInstitution.fetched_at > cutoff)
+            .order_by(PlaidInstitution.fetched_at.desc())
+            .limit(settings.INSTITUTION_CACHE_SIZE)
+            .all()
+        )
+        for row in reversed(rows):
+            institution_cache.set(
+                row.institution_id, row.data, ttl=_remaining_ttl(row.fetched_at)
+            )
+        logger.info(f"Institution cache warmed with {len(rows)} entries")
+    except Exception as e:
+        logger.warning(f"Could not warm institution cache: {e}")
+    finally:
+        db.close()
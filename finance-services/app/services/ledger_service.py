@@ -0,0 +1,86 @@
+# ================================================
+# Imports
+# ================================================
+
+from typing import Iterable, Optional
+
+from sqlalchemy import literal, select, union_all
+
+from app.models.transactions import Transaction
+
+# ================================================
+# Ledger Queries
+# ================================================
+
+LEDGER_COLUMNS = (
+    Transaction.id,
+    Transaction.name,
+    Transaction.sender_id,
+    Transaction.receiver_id,
+    Transaction.sender_bank_id,
+    Transaction.receiver_bank_id,
+    Transaction.amount,
+    Transaction.date,
+    Transaction.type,
+    Transaction.category,
+    Transaction.channel,
+    Transaction.pending,
+)
+
+
+def _ledger_side(party, party_bank, direction: str, user_id: int, bank_id):
+    query = select(
+        *LEDGER_COLUMNS,
+        literal(direction).label("direction"),
+        party_bank.label("bank_id"),
+    ).where(party == user_id)
+    if bank_id is not None:
+        query = query.where(party_bank == bank_id)
+    return query
+
+
+def ledger_entries(user_id: int, bank_id: Optional[int] = None):
+    """
+    The internal transfers a user is party to, as a subquery of ledger entries.
+
+    The entries are a UNION ALL of a sender-side select (direction "debit")
+    and a receiver-side select (direction "credit"). Each side filters on its
+    own (party, date) or (party bank, date) index, which a single OR across
+    both columns cannot do. Besides the transaction columns, every entry
+    carries `direction` and the user's own `bank_id`.
+
+    With `bank_id`, only entries booked on that bank are returned. Without it,
+    a transfer between two of the user's own banks is listed once, as a
+    debit.
+    """
+    debit = _ledger_side(
+        Transaction.sender_id, Transaction.sender_bank_id, "debit", user_id, bank_id
+    )
+    credit = _ledger_side(
+        Transaction.receiver_id,
+        Transaction.receiver_bank_id,
+        "credit",
+        user_id,
+        bank_id,
+    )
+    if bank_id is None:
+        credit = credit.where(Transaction.sender_id.is_distinct_from(user_id))
+
+    return union_all(debit, credit).subquery("ledger")
+
+
+def ledger_query(
+    user_id: int,
+    bank_id: Optional[int] = None,
+    columns: Optional[Iterable[str]] = None,
+):
+    """
+    Select of a user's ledger entries, newest first. `columns` names the entry
+    columns to return, all of them by default.
+    """
+    entries = ledger_entries(user_id, bank_id)
+    if columns:
+        query = select(*(entries.c[name] for name in columns))
+    else:
+        query = select(entries)
+    return query.order_by(entries.c.date.desc(), entries.c.id.desc())
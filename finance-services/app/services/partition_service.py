@@ -0,0 +1,254 @@
+# ================================================
+# Imports
+# ================================================
+
+import asyncio
+import logging
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.utils.database import (
+    DBSession,
+    db_commit,
+    db_execute,
+    db_scalar,
+    session_scope,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================
+# Monthly Partitions
+# ================================================
+
+# `transactions` is range partitioned by month on `date`, one partition per
+# month named transactions_YYYY_MM. Detached partitions are renamed to
+# transactions_archive_YYYY_MM and kept as plain tables. Rows of months without
+# a partition land in the DEFAULT partition transactions_default, and are moved
+# into their month's partition when it is created.
+PARENT = "transactions"
+DEFAULT_PARTITION = f"{PARENT}_default"
+PARTITION_NAME = re.compile(rf"^{PARENT}_(\d{{4}})_(\d{{2}})$")
+
+# Advisory lock serializing partition maintenance across workers
+MAINTENANCE_LOCK_KEY = 0x706172746974  # "partit"
+
+LIST_PARTITIONS = text(
+    """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    WHERE parent.relname = :parent
+    """
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month.year:04d}_{month.month:02d}"
+
+
+async def list_partitions(db: DBSession) -> List[date]:
+    """
+    First day of the month of every attached monthly partition, oldest first.
+    """
+    names = (await db_execute(db, LIST_PARTITIONS, {"parent": PARENT})).scalars()
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+async def default_partition_months(db: DBSession) -> List[date]:
+    """
+    First day of every month that has rows in the DEFAULT partition.
+    """
+    months = await db_execute(
+        db,
+        text(
+            f"SELECT DISTINCT date_trunc('month', date)::date "
+            f"FROM {DEFAULT_PARTITION}"
+        ),
+    )
+    return sorted(months.scalars())
+
+
+async def create_partition(db: DBSession, month: date) -> str:
+    """
+    Create the partition of `month`, moving the month's rows out of the DEFAULT
+    partition into it. A partition cannot be created while the DEFAULT
+    partition still holds rows of its range, so it is built as a plain table
+    and attached once the rows are in.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    await db_execute(
+        db,
+        text(
+            f"CREATE TABLE {name} "
+            f"(LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ),
+    )
+    await db_execute(
+        db,
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE date >= '{start}' AND date < '{end}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+    )
+    await db_execute(
+        db,
+        text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        ),
+    )
+    return name
+
+
+async def ensure_partitions(
+    db: DBSession,
+    months_ahead: int,
+    retention_months: int = 0,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Create the partitions that do not exist yet of the current month, the next
+    `months_ahead` months, and every month with rows in the DEFAULT partition
+    (a date outside the window was inserted) that is still within
+    `retention_months`. Returns the names of the created partitions.
+    """
+    current = (today or date.today()).replace(day=1)
+    existing = set(await list_partitions(db))
+
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    cutoff = add_months(current, -retention_months) if retention_months > 0 else None
+    months.update(
+        month
+        for month in await default_partition_months(db)
+        if cutoff is None or month >= cutoff
+    )
+
+    return [
+        await create_partition(db, month)
+        for month in sorted(months - existing)
+    ]
+
+
+async def archive_partitions(
+    db: DBSession, retention_months: int, today: Optional[date] = None
+) -> List[str]:
+    """
+    Detach the partitions of months older than `retention_months` months and
+    rename them to transactions_archive_YYYY_MM. Their rows stay in the
+    database but are no longer read by queries on `transactions`. Rows of
+    those months inserted later stay in the DEFAULT partition. Returns the
+    names of the archive tables.
+    """
+    if retention_months <= 0:
+        return []
+
+    cutoff = add_months((today or date.today()).replace(day=1), -retention_months)
+    archived = []
+    for month in await list_partitions(db):
+        if month >= cutoff:
+            break
+        name = partition_name(month)
+        archive = name.replace(PARENT, f"{PARENT}_archive", 1)
+        await db_execute(db, text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        await db_execute(db, text(f"ALTER TABLE {name} RENAME TO {archive}"))
+        archived.append(archive)
+    return archived
+
+
+async def maintain_partitions():
+    """
+    Create upcoming partitions and archive expired ones, in one commit.
+
+    Every worker runs this job. They hold a transaction-level advisory lock
+    while they maintain partitions, and a worker that finds it taken skips the
+    run instead of racing the holder on the same DDL.
+    """
+    async with session_scope() as db:
+        locked = await db_scalar(
+            db,
+            text("SELECT pg_try_advisory_xact_lock(:key)").bindparams(
+                key=MAINTENANCE_LOCK_KEY
+            ),
+        )
+        if not locked:
+            logger.info("Partition maintenance is running on another worker")
+            return
+
+        created = await ensure_partitions(
+            db, settings.PARTITION_MONTHS_AHEAD, settings.PARTITION_RETENTION_MONTHS
+        )
+        archived = await archive_partitions(db, settings.PARTITION_RETENTION_MONTHS)
+        await db_commit(db)
+
+    if created:
+        logger.info(f"Created transaction partitions: {', '.join(created)}")
+    if archived:
+        logger.info(f"Archived transaction partitions: {', '.join(archived)}")
+
+
+# ================================================
+# Maintenance Job
+# ================================================
+
+
+class PartitionMaintainer:
+    """
+    Runs `maintain_partitions` on startup and then every `interval` seconds, so
+    inserts always find a partition for the current month.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stopping = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._runner is None:
+            self._stopping.clear()
+            self._runner = asyncio.create_task(self._run())
+            logger.info("Partition maintenance started")
+
+    async def stop(self):
+        if self._runner is None:
+            return
+
+        self._stopping.set()
+        await self._runner
+        self._runner = None
+        logger.info("Partition maintenance stopped")
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await maintain_partitions()
+            except Exception as e:
+                logger.error(f"Partition maintenance failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+partition_maintainer = PartitionMaintainer(
+    interval=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+)
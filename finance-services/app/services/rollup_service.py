@@ -0,0 +1,169 @@
+# ================================================
+# Imports
+# ================================================
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.bank import Bank
+from app.models.plaid import PlaidTransaction
+from app.models.spending import SpendingRollup
+from app.models.transactions import Transaction
+from app.utils.database import DBSession, db_execute, utcnow
+
+# ================================================
+# Rollup Deltas
+# ================================================
+
+# (month, category, account_id) -> [total, count]
+RollupDeltas = Dict[Tuple[date, str, str], list]
+
+
+def new_deltas() -> RollupDeltas:
+    return defaultdict(lambda: [0.0, 0])
+
+
+def month_start(day) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_delta(
+    deltas: RollupDeltas,
+    day,
+    category: Optional[str],
+    account_id: str,
+    amount: float,
+    count: int = 1,
+):
+    bucket = deltas[(month_start(day), category or "", account_id)]
+    bucket[0] += amount
+    bucket[1] += count
+
+
+def add_mirror_delta(deltas: RollupDeltas, row: PlaidTransaction, sign: int = 1):
+    """
+    Count a mirrored Plaid transaction in (sign=1) or out of (sign=-1) the rollups.
+    Plaid amounts are already positive for money leaving the account.
+    """
+    if row.date is None:
+        return
+    add_delta(
+        deltas, row.date, row.category, row.account_id, sign * row.amount, sign
+    )
+
+
+async def apply_deltas(user_id: int, deltas: RollupDeltas, db: DBSession):
+    """
+    Add `deltas` to the user's rollup rows in one upsert. The caller commits,
+    so the rollups move together with the transactions they summarise.
+    """
+    values = [
+        {
+            "user_id": user_id,
+            "month": month,
+            "category": category,
+            "account_id": account_id,
+            "total": total,
+            "count": count,
+        }
+        for (month, category, account_id), (total, count) in deltas.items()
+        if total or count
+    ]
+    if not values:
+        return
+
+    statement = insert(SpendingRollup).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "month", "category", "account_id"],
+        set_={
+            "total": SpendingRollup.total + statement.excluded.total,
+            "count": SpendingRollup.count + statement.excluded.count,
+        },
+    )
+    await db_execute(db, statement)
+
+
+async def record_transfer(transaction: Transaction, db: DBSession):
+    """
+    Roll a new internal transfer into both sides' spending: an outflow for the
+    sender's bank account and an inflow for the receiver's.
+    """
+    bank_ids = [transaction.sender_bank_id, transaction.receiver_bank_id]
+    accounts = dict(
+        (
+            await db_execute(
+                db, select(Bank.id, Bank.account_id).where(Bank.id.in_(bank_ids))
+            )
+        ).all()
+    )
+    day = transaction.date or utcnow()
+
+    for user_id, bank_id, amount in (
+        (transaction.sender_id, transaction.sender_bank_id, transaction.amount),
+        (transaction.receiver_id, transaction.receiver_bank_id, -transaction.amount),
+    ):
+        if user_id is None or bank_id not in accounts:
+            continue
+        deltas = new_deltas()
+        add_delta(deltas, day, transaction.category, accounts[bank_id], amount)
+        await apply_deltas(user_id, deltas, db)
+
+
+# ================================================
+# Summaries
+# ================================================
+
+SUMMARY_GROUPS = {
+    "category": SpendingRollup.category,
+    "month": SpendingRollup.month,
+    "account": SpendingRollup.account_id,
+}
+
+
+async def get_spending_summary(
+    user_id: int,
+    group: str,
+    db: DBSession,
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+) -> dict:
+    """
+    Spending totals of a user grouped by category, month or account, read from
+    the rollups. The work depends on the number of buckets, not transactions.
+    """
+    column = SUMMARY_GROUPS[group]
+    query = select(
+        column,
+        func.sum(SpendingRollup.total),
+        func.sum(SpendingRollup.count),
+    ).where(SpendingRollup.user_id == user_id)
+    if start_month:
+        query = query.where(SpendingRollup.month >= month_start(start_month))
+    if end_month:
+        query = query.where(SpendingRollup.month <= month_start(end_month))
+    query = (
+        query.group_by(column)
+        .having(func.sum(SpendingRollup.count) > 0)
+        .order_by(column)
+    )
+
+    try:
+        rows = (await db_execute(db, query)).all()
+    except Exception as e:
+        print("Error getting spending summary:", e)
+        raise HTTPException(
+            status_code=500, detail=f"Could not get spending summary: {e}"
+        )
+
+    return {
+        "group": group,
+        "totals": [
+            {group: key, "total": round(total, 2), "count": count}
+            for key, total, count in rows
+        ],
+    }
@@ -0,0 +1,256 @@
+# ================================================
+# Imports
+# ================================================
+
+import asyncio
+import logging
+import random
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+
+from app.core.config import settings
+from app.models.bank import Bank
+from app.models.plaid import PlaidItem
+from app.services.bank_service import sync_balances
+from app.services.transaction_service import schedule_item_sync, sync_transactions
+from app.utils.database import (
+    DBSession,
+    db_commit,
+    db_execute,
+    db_scalars,
+    session_scope,
+)
+from app.utils.plaid_client import decrypt_id
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================
+# Sync Scheduler
+# ================================================
+
+
+class SyncScheduler:
+    """
+    Refreshes the balances and transactions of every linked Plaid item in the
+    background so request handlers can serve the mirrored data.
+
+    The schedule lives on the `plaid_items` rows, so every worker process runs
+    a scheduler without polling an item more than once: each tick claims due
+    items that no other worker is claiming (FOR UPDATE SKIP LOCKED) and leases
+    them for `lease` seconds. An item whose worker dies mid-sync is due again
+    once its lease runs out.
+
+    Each item gets its own jittered due time. Failed items back off
+    exponentially up to `max_backoff` seconds, and each worker syncs at most
+    `concurrency` items at once. With `poll` disabled, items are only synced
+    when `request_sync` asks for it (e.g. from a Plaid webhook).
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        concurrency: int,
+        jitter: float,
+        max_backoff: float,
+        lease: float,
+        poll: bool = True,
+        debounce: float = 0.0,
+        tick: float = 5.0,
+    ):
+        self.interval = interval
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll = poll
+        self.debounce = debounce
+        self.tick = min(tick, interval)
+
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+    # ---------- Lifecycle ----------
+
+    def start(self):
+        if self._runner is None:
+            self._stopping.clear()
+            self._runner = asyncio.create_task(self._run())
+            logger.info("Sync scheduler started")
+
+    async def stop(self):
+        if self._runner is None:
+            return
+
+        self._stopping.set()
+        await self._runner
+        self._runner = None
+
+        # Cancelled items are picked up again when their lease runs out
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Sync scheduler stopped")
+
+    # ---------- Scheduling ----------
+
+    def _jittered(self, delay: float) -> timedelta:
+        factor = random.uniform(1 - self.jitter, 1 + self.jitter)
+        return timedelta(seconds=delay * factor)
+
+    async def request_sync(self, item_id: str):
+        """
+        Queue a targeted sync of one item, run by whichever worker claims it.
+
+        Repeated requests within the debounce window collapse into one sync. A
+        request for an item that is syncing right now queues one follow-up run,
+        and items backing off after failures keep their backoff.
+        """
+        async with session_scope() as db:
+            await schedule_item_sync(item_id, self.debounce, db)
+            await db_commit(db)
+
+    async def _claim_due_items(self, limit: int) -> List[Tuple[Bank, int]]:
+        """
+        Lease up to `limit` due items to this worker. Returns a bank of each
+        claimed item with the item's count of consecutive failures.
+        """
+        now = func.now()
+        due = (
+            select(PlaidItem.id)
+            .where(
+                or_(
+                    and_(
+                        PlaidItem.sync_lease_until.is_(None),
+                        PlaidItem.next_sync_at <= now,
+                    ),
+                    PlaidItem.sync_lease_until < now,
+                )
+            )
+            .order_by(PlaidItem.next_sync_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        async with session_scope() as db:
+            claimed = (
+                await db_execute(
+                    db,
+                    update(PlaidItem)
+                    .where(PlaidItem.id.in_(due))
+                    .values(
+                        sync_lease_until=now + timedelta(seconds=self.lease),
+                        next_sync_at=None,
+                    )
+                    .returning(PlaidItem.item_id, PlaidItem.sync_failures)
+                    .execution_options(synchronize_session=False),
+                )
+            ).all()
+            failures = dict(claimed)
+
+            banks = {}
+            if failures:
+                for bank in await db_scalars(
+                    db, select(Bank).where(Bank.bank_id.in_(list(failures)))
+                ):
+                    banks.setdefault(bank.bank_id, bank)
+
+            # Items whose banks were all unlinked are left unscheduled
+            orphans = [item_id for item_id in failures if item_id not in banks]
+            if orphans:
+                await db_execute(
+                    db,
+                    update(PlaidItem)
+                    .where(PlaidItem.item_id.in_(orphans))
+                    .values(sync_lease_until=None)
+                    .execution_options(synchronize_session=False),
+                )
+            await db_commit(db)
+
+        return [(bank, failures[item_id]) for item_id, bank in banks.items()]
+
+    async def _release(self, item_id: str, failures: int, db: DBSession):
+        """
+        End the lease of a synced item and schedule its next sync: after a
+        jittered interval (if polling) on success, after a backoff on failure.
+        A sync requested while the item was syncing is kept either way.
+        """
+        if failures:
+            backoff = min(self.max_backoff, self.interval * 2 ** (failures - 1))
+            next_sync_at = func.now() + self._jittered(backoff)
+        elif self.poll:
+            next_sync_at = func.coalesce(
+                PlaidItem.next_sync_at, func.now() + self._jittered(self.interval)
+            )
+        else:
+            next_sync_at = PlaidItem.next_sync_at
+
+        await db_execute(
+            db,
+            update(PlaidItem)
+            .where(PlaidItem.item_id == item_id)
+            .values(
+                sync_lease_until=None,
+                sync_failures=failures,
+                next_sync_at=next_sync_at,
+            )
+            .execution_options(synchronize_session=False),
+        )
+        await db_commit(db)
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                free = self.concurrency - len(self._in_flight)
+                if free > 0:
+                    for bank, failures in await self._claim_due_items(free):
+                        task = asyncio.create_task(self._sync_item(bank, failures))
+                        self._in_flight[bank.bank_id] = task
+                        task.add_done_callback(
+                            lambda _, item_id=bank.bank_id: self._in_flight.pop(
+                                item_id, None
+                            )
+                        )
+            except Exception as e:
+                logger.error(f"Sync scheduler tick failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.tick)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _sync_item(self, bank: Bank, failures: int):
+        # Plain copies, so nothing below reads `bank` after a failed sync has
+        # rolled the session back
+        item_id, user_id = bank.bank_id, bank.user_id
+        async with session_scope() as db:
+            try:
+                access_token = decrypt_id(bank.access_token)
+                await sync_balances(access_token, item_id, user_id, db)
+                await sync_transactions(access_token, item_id, user_id, db)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Background sync failed for item {item_id}: {e}")
+
+            try:
+                await self._release(item_id, failures, db)
+            except Exception as e:
+                logger.error(f"Could not reschedule item {item_id}: {e}")
+
+
+sync_scheduler = SyncScheduler(
+    interval=settings.SYNC_INTERVAL_SECONDS,
+    concurrency=settings.SYNC_CONCURRENCY,
+    jitter=settings.SYNC_JITTER,
+    max_backoff=settings.SYNC_MAX_BACKOFF_SECONDS,
+    lease=settings.SYNC_LEASE_SECONDS,
+    poll=settings.SYNC_POLL,
+    debounce=settings.PLAID_WEBHOOK_DEBOUNCE_SECONDS,
+)
@@ -3,21 +3,45 @@
 # ================================================
 
 import asyncio
+import base64
+import heapq
+import json
+from itertools import chain, islice
+from datetime import date, datetime, time, timezone, timedelta
+from typing import Iterable, List, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from fastapi import Depends, HTTPException
 
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
-
+from app.core.config import settings
 from app.services.auth_service import authenticate_user
-from app.utils.plaid_client import client, encrypt_id, decrypt_id
+from app.services.ledger_service import ledger_entries, ledger_query
+from app.services.rollup_service import add_mirror_delta, apply_deltas, new_deltas
+from app.utils.database import (
+    DBSession,
+    db_commit,
+    db_execute,
+    db_refresh,
+    db_rollback,
+    db_scalar,
+    db_scalars,
+    row_dicts,
+    utcnow,
+)
+from app.utils.plaid_client import async_client, encrypt_id, decrypt_id
+from app.utils.singleflight import plaid_flight
+from app.utils.plaid_projection import TransactionRecord, project_transaction
+from app.utils.resilience import UpstreamUnavailable
 from app.models.user import User
 from app.models.bank import Bank
 from app.models.transactions import Transaction
+from app.models.plaid import PlaidItem, PlaidTransaction
 from app.schemas.transaction import (
     TransactionParams,
     TransactionResponse,
+    TransactionResponseList,
     TransactionsResponse,
 )
 
@@ -26,52 +50,52 @@ from app.schemas.transaction import (
 # ================================================
 
 
-async def get_transactions_by_bank(current_user: User, current_bank: Bank, db: Session):
+async def get_transactions_by_bank(
+    current_user: User, current_bank: Bank, db: DBSession
+):
     """
-    Fetch transactions associated with a user and specific bank.
+    Fetch the ledger entries of a user on a specific bank, newest first.
     """
     try:
-        transactions = (
-            db.query(Transaction)
-            .filter(
-                or_(
-                    Transaction.sender_id == current_user.id,
-                    Transaction.receiver_id == current_user.id,
-                ),
-                or_(
-                    Transaction.sender_bank_id == current_bank.id,
-                    Transaction.receiver_bank_id == current_bank.id,
-                ),
-            )
-            .all()
+        entries = await db_execute(
+            db,
+            ledger_query(
+                current_user.id, current_bank.id, TransactionResponse.model_fields
+            ),
         )
 
-        return [
-            TransactionResponse.model_validate(transaction)
-            for transaction in transactions
-        ]
+        return TransactionResponseList.validate_python(row_dicts(entries))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Could not get Transactions : {e}")
 
 
-async def getAllTransactions(current_user: User, db: Session):
+def iter_transactions_by_bank(user_id: int, bank_id: int, db: Session):
+    """
+    Stream the ledger entries of a user on a bank, newest first, without
+    loading them all at once.
+    """
+    return db.execute(
+        ledger_query(user_id, bank_id),
+        execution_options={"yield_per": settings.STREAM_BATCH_SIZE},
+    )
+
+
+async def getAllTransactions(current_user: User, db: DBSession):
     """
     Fetch all transactions for a user.
     """
     try:
-        transactions = (
-            db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-        )
+        query = ledger_query(current_user.id, columns=TransactionResponse.model_fields)
+        entries = row_dicts(await db_execute(db, query))
 
-        if not transactions:
+        if not entries:
             raise HTTPException(status_code=404, detail="Transactions not found")
 
-        return [
-            TransactionResponse.model_validate(transaction)
-            for transaction in transactions
-        ]
+        return TransactionResponseList.validate_python(entries)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Could not get Transactions : {e}")
 
@@ -82,7 +106,7 @@ async def getAllTransactions(current_user: User, db: Session):
 
 
 async def createTransactions(
-    request: TransactionParams, currentuser: User, db: Session
+    request: TransactionParams, currentuser: User, db: DBSession
 ):
     """
     Create a new transaction record in the database.
@@ -104,8 +128,8 @@ async def createTransactions(
         )
 
         db.add(new_transaction)
-        db.commit()  # <-- Fixed missing parentheses
-        db.refresh(new_transaction)
+        await db_commit(db)
+        await db_refresh(db, new_transaction)
 
         return {
             "transaction": {
@@ -128,60 +152,543 @@ async def createTransactions(
 
 
 # ================================================
-# Plaid API: Get Transactions
+# Bulk Ingestion
 # ================================================
 
 
-async def get_transactions(access_token: str, target_account_id: str):
+# Columns refreshed when an ingested transaction ID already exists
+MIRROR_UPSERT_COLUMNS = (
+    "item_id",
+    "account_id",
+    "name",
+    "amount",
+    "date",
+    "category",
+    "payment_channel",
+    "pending",
+    "image",
+)
+
+
+def _batches(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def _mirror_rows(transaction_ids, db: DBSession) -> List[PlaidTransaction]:
+    if not transaction_ids:
+        return []
+    return await db_scalars(
+        db,
+        select(PlaidTransaction).where(
+            PlaidTransaction.transaction_id.in_(list(transaction_ids))
+        ),
+    )
+
+
+async def lock_item(item: PlaidItem, db: DBSession) -> PlaidItem:
     """
-    Fetch and filter transactions from Plaid API for a specific account.
+    Lock the item's row until the end of the transaction and reload it.
+
+    The same item can be synced at once by the scheduler, the request path,
+    webhooks and other workers. Rollup deltas are computed from the mirror as
+    it is before each write, so writers of an item must take this lock first
+    and apply their changes one at a time.
+    """
+    return await db_scalar(
+        db,
+        select(PlaidItem)
+        .where(PlaidItem.id == item.id)
+        .with_for_update()
+        .execution_options(populate_existing=True),
+    )
+
+
+async def ingest_transactions(
+    item: PlaidItem,
+    records: Iterable[TransactionRecord],
+    db: DBSession,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Write mirror records of a Plaid item in batches of multi-row upserts.
+
+    `records` can be any iterable, e.g. a generator over a backfill, and is
+    consumed one batch at a time. Rows are keyed on the Plaid transaction ID,
+    so re-ingesting the same records updates them in place instead of failing
+    or duplicating. The item's spending rollups follow every batch. The item
+    row stays locked until the caller commits. Returns the number of records
+    written.
+    """
+    await lock_item(item, db)
+
+    written = 0
+    for batch in _batches(records, batch_size or settings.INGEST_BATCH_SIZE):
+        # The last record of a transaction ID wins, as in a sync delta
+        upserts = {record.transaction_id: record for record in batch}
+
+        deltas = new_deltas()
+        for row in await _mirror_rows(upserts.keys(), db):
+            add_mirror_delta(deltas, row, sign=-1)
+        for record in upserts.values():
+            add_mirror_delta(deltas, record)
+
+        statement = insert(PlaidTransaction).values(
+            [
+                {
+                    "transaction_id": transaction_id,
+                    "item_id": item.item_id,
+                    **record.mirror_fields(),
+                }
+                for transaction_id, record in upserts.items()
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["transaction_id"],
+            set_={
+                column: statement.excluded[column]
+                for column in MIRROR_UPSERT_COLUMNS
+            },
+        )
+        await db_execute(db, statement)
+
+        if item.user_id is not None:
+            await apply_deltas(item.user_id, deltas, db)
+        written += len(upserts)
+
+    return written
+
+
+# ================================================
+# Plaid API: Sync Transactions
+# ================================================
+
+
+async def get_or_create_item(item_id: str, user_id: int, db: DBSession) -> PlaidItem:
+    """
+    Return the sync state row of a Plaid item, creating it on first use.
+    """
+    query = select(PlaidItem).where(PlaidItem.item_id == item_id)
+    item = await db_scalar(db, query)
+    if item is None:
+        # Concurrent first uses of an item all insert; all but one are no-ops
+        await db_execute(
+            db,
+            insert(PlaidItem)
+            .values(item_id=item_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["item_id"]),
+        )
+        item = await db_scalar(db, query)
+    return item
+
+
+async def schedule_item_sync(item_id: str, delay: float, db: DBSession):
+    """
+    Make the background sync of an item due within `delay` seconds, unless it
+    is already due sooner or is backing off after failures. A request for an
+    item being synced right now makes it due again once that sync finishes.
+    The caller commits.
+    """
+    due = func.now() + timedelta(seconds=delay)
+    await db_execute(
+        db,
+        update(PlaidItem)
+        .where(PlaidItem.item_id == item_id, PlaidItem.sync_failures == 0)
+        .values(
+            next_sync_at=func.least(func.coalesce(PlaidItem.next_sync_at, due), due)
+        )
+        .execution_options(synchronize_session=False),
+    )
+
+
+def is_recently_synced(synced_at: Optional[datetime]) -> bool:
+    """
+    Whether data synced at `synced_at` is recent enough to be served without
+    going back to Plaid on the request path.
+    """
+    if synced_at is None:
+        return False
+    if synced_at.tzinfo is None:
+        synced_at = synced_at.replace(tzinfo=timezone.utc)
+    age = datetime.now(timezone.utc) - synced_at
+    return age < timedelta(seconds=settings.SYNC_STALE_AFTER_SECONDS)
+
+
+async def fetch_transactions_delta(
+    access_token: str, item_id: str, cursor: Optional[str]
+):
+    """
+    Page through `/transactions/sync` starting at `cursor`.
+
+    Returns the upserted `TransactionRecord`s keyed by transaction ID, the
+    removed transaction IDs and the cursor to resume from next time. Concurrent
+    fetches of the same item from the same cursor share one paging run.
+    """
+    return await plaid_flight.do(
+        ("transactions_sync", item_id, cursor),
+        lambda: _page_transactions_sync(access_token, cursor),
+    )
+
+
+async def _page_transactions_sync(access_token: str, cursor: Optional[str]):
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest
+
+    has_more = True
+    upserts = {}
+    removed = set()
+
+    while has_more:
+        request = (
+            TransactionsSyncRequest(access_token=access_token, cursor=cursor)
+            if cursor
+            else TransactionsSyncRequest(access_token=access_token)
+        )
+
+        response = await async_client.transactions_sync(request)
+
+        for transaction in chain(response.added, response.modified):
+            record = project_transaction(transaction)
+            upserts[record.transaction_id] = record
+            removed.discard(record.transaction_id)
+
+        for transaction in response.removed:
+            upserts.pop(transaction.transaction_id, None)
+            removed.add(transaction.transaction_id)
+
+        has_more = response.has_more
+        cursor = response.next_cursor
+
+    return upserts, removed, cursor
+
+
+async def apply_transactions_delta(
+    item: PlaidItem,
+    from_cursor: Optional[str],
+    upserts: dict,
+    removed: set,
+    cursor: str,
+    db: DBSession,
+) -> bool:
+    """
+    Apply a `/transactions/sync` delta fetched from `from_cursor` to the mirror
+    and the item's spending rollups, and advance the item cursor, all in the
+    same commit.
+
+    Returns False without writing anything if the item's cursor moved while
+    the delta was being fetched: another sync has already applied it.
+    """
+    await lock_item(item, db)
+    if item.cursor != from_cursor:
+        await db_commit(db)
+        return False
+
+    if removed:
+        deltas = new_deltas()
+        for row in await _mirror_rows(removed, db):
+            add_mirror_delta(deltas, row, sign=-1)
+
+        await db_execute(
+            db,
+            delete(PlaidTransaction)
+            .where(PlaidTransaction.transaction_id.in_(removed))
+            .execution_options(synchronize_session=False),
+        )
+        if item.user_id is not None:
+            await apply_deltas(item.user_id, deltas, db)
+
+    await ingest_transactions(item, upserts.values(), db)
+
+    item.cursor = cursor
+    item.transactions_synced_at = utcnow()
+    await db_commit(db)
+    return True
+
+
+async def sync_transactions(
+    access_token: str, item_id: str, user_id: int, db: DBSession
+):
+    """
+    Bring the local transaction mirror of a Plaid item up to date.
+
+    Resumes `/transactions/sync` from the cursor stored for the item, so only the
+    delta since the last sync is requested. Added/modified rows are upserted,
+    removed rows are deleted, and the new cursor is committed together with them.
+    A delta that another sync of the item applied in the meantime is dropped.
     """
     try:
-        has_more = True
-        cursor = None
-        transactions = []
-
-        while has_more:
-            request = (
-                TransactionsSyncRequest(access_token=access_token, cursor=cursor)
-                if cursor
-                else TransactionsSyncRequest(access_token=access_token)
-            )
+        item = await get_or_create_item(item_id, user_id, db)
+        from_cursor = item.cursor
+        # The item is not locked while Plaid is paged, only while applying
+        upserts, removed, cursor = await fetch_transactions_delta(
+            access_token, item_id, from_cursor
+        )
+        await apply_transactions_delta(
+            item, from_cursor, upserts, removed, cursor, db
+        )
+        return item
 
-            print("Getting Transactions response...")
-            response = client.transactions_sync(request)
-            data = response.to_dict()
-
-            added_transactions = data.get("added", [])
-
-            for transaction in added_transactions:
-                if transaction.get("account_id") == target_account_id:
-                    transactions.append(
-                        {
-                            "id": transaction.get("transaction_id"),
-                            "name": transaction.get("name"),
-                            "payment_channel": transaction.get("payment_channel"),
-                            "type": transaction.get("payment_channel"),
-                            "account_id": transaction.get("account_id"),
-                            "amount": transaction.get("amount"),
-                            "pending": transaction.get("pending"),
-                            "category": (
-                                transaction.get("personal_finance_category", {}).get(
-                                    "primary"
-                                )
-                                if transaction.get("personal_finance_category")
-                                else ""
-                            ),
-                            "date": transaction.get("date"),
-                            "image": transaction.get("logo_url"),
-                        }
-                    )
-
-            has_more = data.get("has_more", False)
-            cursor = data.get("next_cursor")
-
-        return transactions
+    except UpstreamUnavailable:
+        await db_rollback(db)
+        raise
+    except Exception as e:
+        await db_rollback(db)
+        print("An error occurred while syncing the transactions:", e)
+        raise HTTPException(status_code=500, detail=f"Could not sync transactions: {e}")
+
+
+def _mirror_transaction_payload(transaction: PlaidTransaction) -> dict:
+    return {
+        "id": transaction.transaction_id,
+        "name": transaction.name,
+        "payment_channel": transaction.payment_channel,
+        "type": transaction.payment_channel,
+        "account_id": transaction.account_id,
+        "amount": transaction.amount,
+        "pending": transaction.pending,
+        "category": transaction.category,
+        "date": transaction.date,
+        "image": transaction.image,
+    }
+
+
+def _account_transactions_query(item_id: str, account_id: str):
+    # Served by ix_plaid_transactions_item_account_date, in index order
+    return (
+        select(PlaidTransaction)
+        .where(
+            PlaidTransaction.item_id == item_id,
+            PlaidTransaction.account_id == account_id,
+        )
+        .order_by(PlaidTransaction.date.desc(), PlaidTransaction.id.desc())
+    )
+
+
+async def get_account_transactions(
+    item_id: str, account_id: str, db: DBSession
+) -> List[dict]:
+    """
+    Read the mirrored Plaid transactions of one account from Postgres, newest
+    first.
+    """
+    try:
+        return [
+            _mirror_transaction_payload(row)
+            for row in await db_scalars(
+                db, _account_transactions_query(item_id, account_id)
+            )
+        ]
 
     except Exception as e:
         print("An error occurred while getting the transactions:", e)
         raise HTTPException(status_code=500, detail=f"Could not get transactions: {e}")
+
+
+def iter_account_transactions(item_id: str, account_id: str, db: Session):
+    """
+    Stream the mirrored Plaid transactions of an account, newest first, without
+    loading them all at once.
+    """
+    rows = db.scalars(
+        _account_transactions_query(item_id, account_id).execution_options(
+            yield_per=settings.STREAM_BATCH_SIZE
+        )
+    )
+    return (_mirror_transaction_payload(row) for row in rows)
+
+
+# ================================================
+# Transaction History
+# ================================================
+
+# History entries are ordered newest first by (timestamp, source rank, row ID).
+# Plaid rows only carry a date and sort at midnight of that day; at equal
+# timestamps transfers come before Plaid rows.
+TRANSFER_RANK = 1
+PLAID_RANK = 0
+
+
+def encode_history_cursor(key: tuple) -> str:
+    timestamp, rank, row_id = key
+    raw = json.dumps([timestamp.isoformat(), rank, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, rank, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(rank), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _past_cursor(date_column, id_column, rank: int, cursor_date, key: tuple):
+    """
+    Filter for the rows of one source (all of `rank`) that sort after the
+    cursor `key`, with `cursor_date` the cursor timestamp in the column's type.
+    """
+    _, cursor_rank, cursor_id = key
+    if rank < cursor_rank:
+        return date_column <= cursor_date
+    if rank > cursor_rank:
+        return date_column < cursor_date
+    return tuple_(date_column, id_column) < (cursor_date, cursor_id)
+
+
+def _history_transfers(
+    user_id: int,
+    bank: Optional[Bank],
+    key: Optional[tuple],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    limit: int,
+):
+    entries = ledger_entries(user_id, bank.id if bank else None)
+    query = select(entries)
+    if start_date:
+        query = query.where(entries.c.date >= datetime.combine(start_date, time.min))
+    if end_date:
+        query = query.where(
+            entries.c.date < datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+    if key:
+        query = query.where(
+            _past_cursor(entries.c.date, entries.c.id, TRANSFER_RANK, key[0], key)
+        )
+    return query.order_by(entries.c.date.desc(), entries.c.id.desc()).limit(limit)
+
+
+def _history_mirror(
+    banks: List[Bank],
+    key: Optional[tuple],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    limit: int,
+):
+    query = select(PlaidTransaction).where(
+        tuple_(PlaidTransaction.item_id, PlaidTransaction.account_id).in_(
+            [(bank.bank_id, bank.account_id) for bank in banks]
+        ),
+        PlaidTransaction.date.isnot(None),
+    )
+    if start_date:
+        query = query.where(PlaidTransaction.date >= start_date)
+    if end_date:
+        query = query.where(PlaidTransaction.date <= end_date)
+    if key:
+        timestamp = key[0]
+        if timestamp.time() == time.min:
+            query = query.where(
+                _past_cursor(
+                    PlaidTransaction.date,
+                    PlaidTransaction.id,
+                    PLAID_RANK,
+                    timestamp.date(),
+                    key,
+                )
+            )
+        else:
+            # Every Plaid row of that day sorts at midnight, past the cursor
+            query = query.where(PlaidTransaction.date <= timestamp.date())
+    return query.order_by(
+        PlaidTransaction.date.desc(), PlaidTransaction.id.desc()
+    ).limit(limit)
+
+
+def _history_transfer_payload(entry) -> dict:
+    return {
+        "id": entry.id,
+        "source": "transfer",
+        "name": entry.name,
+        "amount": entry.amount,
+        "date": entry.date.date(),
+        "type": entry.direction,
+        "category": entry.category,
+        "payment_channel": "internal",
+        "pending": entry.pending,
+    }
+
+
+async def get_transaction_history(
+    current_user: User,
+    db: DBSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    shareable_id: Optional[str] = None,
+) -> dict:
+    """
+    One page of a user's internal transfers and mirrored Plaid transactions,
+    merged newest first, optionally narrowed to one bank account.
+
+    Pages are keyset-paginated: both sources are read from the cursor onwards
+    in index order and at most `limit + 1` rows are fetched from each, so a
+    page costs the same however deep into the history it is.
+    """
+    key = decode_history_cursor(cursor) if cursor else None
+
+    try:
+        bank_query = select(Bank).where(Bank.user_id == current_user.id)
+        if shareable_id:
+            bank_query = bank_query.where(Bank.shareable_id == shareable_id)
+        banks = await db_scalars(db, bank_query)
+
+        bank = None
+        if shareable_id:
+            if not banks:
+                raise HTTPException(status_code=404, detail="Bank not found")
+            bank = banks[0]
+
+        transfers = (
+            await db_execute(
+                db,
+                _history_transfers(
+                    current_user.id, bank, key, start_date, end_date, limit + 1
+                ),
+            )
+        ).all()
+        mirrored = []
+        if banks:
+            mirrored = await db_scalars(
+                db, _history_mirror(banks, key, start_date, end_date, limit + 1)
+            )
+
+        entries = heapq.merge(
+            (
+                (
+                    (entry.date, TRANSFER_RANK, entry.id),
+                    _history_transfer_payload(entry),
+                )
+                for entry in transfers
+            ),
+            (
+                (
+                    (datetime.combine(row.date, time.min), PLAID_RANK, row.id),
+                    {**_mirror_transaction_payload(row), "source": "plaid"},
+                )
+                for row in mirrored
+            ),
+            key=lambda entry: entry[0],
+            reverse=True,
+        )
+        page = list(islice(entries, limit + 1))
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_history_cursor(page[-1][0])
+
+        return {
+            "transactions": [payload for _, payload in page],
+            "next_cursor": next_cursor,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("Error getting transaction history:", e)
+        raise HTTPException(
+            status_code=500, detail=f"Could not get transaction history: {e}"
+        )
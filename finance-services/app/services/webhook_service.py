@@ -0,0 +1,143 @@
+# ================================================
+# Imports
+# ================================================
+
+import hashlib
+import hmac
+import json
+import logging
+import time
+
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.bank import Bank
+from app.services.sync_scheduler import sync_scheduler
+from app.utils.cache import TTLCache
+from app.utils.database import db_scalar, session_scope
+from app.utils.plaid_client import async_client
+from app.utils.singleflight import plaid_flight
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================
+# Configuration
+# ================================================
+
+# Webhooks that mean an item's data changed upstream. A queued sync refreshes
+# the item's balances and then its transactions, so transaction updates also
+# bring balances up to date; Plaid sends no webhook for balance changes alone.
+SYNC_WEBHOOKS = {
+    ("TRANSACTIONS", "SYNC_UPDATES_AVAILABLE"),
+    ("TRANSACTIONS", "INITIAL_UPDATE"),
+    ("TRANSACTIONS", "HISTORICAL_UPDATE"),
+    ("TRANSACTIONS", "DEFAULT_UPDATE"),
+    # Accounts were added to the item: their balances need mirroring
+    ("ITEM", "NEW_ACCOUNTS_AVAILABLE"),
+}
+
+MAX_WEBHOOK_AGE_SECONDS = 5 * 60
+
+_verification_keys = TTLCache(maxsize=16, ttl=3600)
+
+
+# ================================================
+# Verification
+# ================================================
+
+
+async def _get_verification_key(key_id: str) -> dict:
+    key = _verification_keys.get(key_id)
+    if key is None:
+        from plaid.model.webhook_verification_key_get_request import (
+            WebhookVerificationKeyGetRequest,
+        )
+
+        response = await plaid_flight.do(
+            ("webhook_verification_key_get", key_id),
+            lambda: async_client.webhook_verification_key_get(
+                WebhookVerificationKeyGetRequest(key_id=key_id)
+            ),
+        )
+        key = response.key.to_dict()
+        _verification_keys.set(key_id, key)
+    return key
+
+
+async def verify_plaid_webhook(body: bytes, signed_jwt: str):
+    """
+    Check the `Plaid-Verification` JWT of a webhook against its raw body.
+
+    Verification can only be switched off (PLAID_WEBHOOK_VERIFY=false) outside
+    production, which lets a local fake sender post unsigned webhooks.
+    """
+    if not settings.PLAID_WEBHOOK_VERIFY and settings.MODE != "production":
+        return
+
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Webhook verification failed.",
+    )
+
+    if not signed_jwt:
+        raise unauthorized
+
+    try:
+        header = jwt.get_unverified_header(signed_jwt)
+        if header.get("alg") != "ES256" or not header.get("kid"):
+            raise unauthorized
+
+        key = await _get_verification_key(header["kid"])
+        if key.get("expired_at"):
+            raise unauthorized
+
+        claims = jwt.decode(signed_jwt, key, algorithms=["ES256"])
+    except JWTError:
+        raise unauthorized
+
+    if time.time() - claims.get("iat", 0) > MAX_WEBHOOK_AGE_SECONDS:
+        raise unauthorized
+
+    body_sha256 = hashlib.sha256(body).hexdigest()
+    if not hmac.compare_digest(body_sha256, claims.get("request_body_sha256", "")):
+        raise unauthorized
+
+
+# ================================================
+# Handling
+# ================================================
+
+
+async def handle_plaid_webhook(body: bytes) -> dict:
+    """
+    Queue an incremental sync of the item a verified webhook refers to.
+
+    Unknown webhook types and items are acknowledged and ignored, so Plaid
+    does not keep retrying them.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid webhook body."
+        )
+
+    webhook = (payload.get("webhook_type"), payload.get("webhook_code"))
+    item_id = payload.get("item_id")
+
+    if webhook not in SYNC_WEBHOOKS or not item_id:
+        return {"status": "ignored"}
+
+    async with session_scope() as db:
+        linked = await db_scalar(db, select(Bank.id).where(Bank.bank_id == item_id))
+
+    if not linked:
+        logger.info(f"Webhook {webhook} for unknown item {item_id} ignored")
+        return {"status": "ignored"}
+
+    await sync_scheduler.request_sync(item_id)
+    logger.info(f"Webhook {webhook} queued a sync of item {item_id}")
+    return {"status": "queued"}
@@ -0,0 +1,83 @@
+"""
+Module: utils.cache
+Description:
+    Small in-process caches shared by the services.
+
+Classes:
+    TTLCache:
+        Size-bounded LRU mapping whose entries expire after a time-to-live.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache with per-entry expiry.
+
+    Args:
+        maxsize (int): Maximum number of entries; the least recently used entry
+                       is evicted when it is exceeded.
+        ttl (float): Default time-to-live of an entry, in seconds.
+
+    Example:
+        >>> cache = TTLCache(maxsize=128, ttl=60)
+        >>> cache.set("key", "value")
+        >>> cache.get("key")
+        'value'
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is missing or expired.
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store `value` under `key` for `ttl` seconds (the cache default if omitted).
+        """
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def keys(self) -> list:
+        """
+        Snapshot of the keys currently stored, expired ones included.
+        """
+        return list(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
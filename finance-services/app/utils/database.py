@@ -1,30 +1,303 @@
-from sqlalchemy import create_engine
+import os
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from typing import Union
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings  # Import settings from config.py
+from app.utils.db_pool import instrumented_pool
+from app.utils.db_replica import ReplicaRouter
+from app.utils.metrics import register_collector
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
 # PostgreSQL Configuration (Historical Data)
 
-engine = create_engine(
-    settings.postgres_database_url, echo=True
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    echo=settings.DB_ECHO,
+)
+
+
+def _create_engine(url: str, pool_name: str):
+    return create_engine(
+        url,
+        poolclass=instrumented_pool(QueuePool, pool_name),
+        connect_args=(
+            {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+            if settings.DB_STATEMENT_TIMEOUT_MS
+            else {}
+        ),
+        **pool_options,
+    )
+
+
+def _create_async_engine(url: str, pool_name: str):
+    return create_async_engine(
+        url,
+        poolclass=instrumented_pool(AsyncAdaptedQueuePool, pool_name),
+        connect_args=(
+            {
+                "server_settings": {
+                    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+                }
+            }
+            if settings.DB_STATEMENT_TIMEOUT_MS
+            else {}
+        ),
+        **pool_options,
+    )
+
+
+engine = _create_engine(
+    settings.postgres_database_url, "db_pool"
 )  # Use the postgres_database_url property from Settings
 SessionLocal = sessionmaker(
     bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
 )
 
+# Async engine (asyncpg), used for request handling when DB_ASYNC is enabled.
+# The sync engine above stays around for startup tasks and streamed reads.
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_engine = _create_async_engine(
+        settings.postgres_async_database_url, "db_async_pool"
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+# Read replica (optional), used by `get_read_db` in the same mode as above
+replica_engine = None
+ReplicaSessionLocal = None
+AsyncReplicaSessionLocal = None
+if settings.postgres_replica_database_url:
+    if settings.DB_ASYNC:
+        replica_engine = _create_async_engine(
+            settings.postgres_replica_async_database_url, "db_replica_pool"
+        )
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            bind=replica_engine, autoflush=False, expire_on_commit=False
+        )
+    else:
+        replica_engine = _create_engine(
+            settings.postgres_replica_database_url, "db_replica_pool"
+        )
+        ReplicaSessionLocal = sessionmaker(
+            bind=replica_engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+DBSession = Union[Session, AsyncSession]
+
 
 Base = declarative_base()
 
 
+@asynccontextmanager
+async def _scope(async_factory, sync_factory):
+    if async_factory is not None:
+        async with async_factory() as db:
+            yield db
+    else:
+        db = sync_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+def session_scope():
+    """
+    Open a session of the configured kind and close it afterwards.
+    """
+    return _scope(AsyncSessionLocal, SessionLocal)
+
+
+def replica_session_scope():
+    """
+    Like `session_scope`, on the read replica. Only valid when one is configured.
+    """
+    return _scope(AsyncReplicaSessionLocal, ReplicaSessionLocal)
+
+
 # Dependency for FastAPI
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with session_scope() as db:
+        yield db
+
+
+# ================================================
+# Read Replica Routing
+# ================================================
+
+READ_PRIMARY_COOKIE = "read_primary"
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+# (an idle primary does not make it lag) or when it is not a standby at all
+REPLICA_LAG = text(
+    """
+    SELECT COALESCE(
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END,
+        0
+    )
+    """
+)
+
+
+async def _measure_replica_lag() -> float:
+    async with replica_session_scope() as db:
+        return float((await db_execute(db, REPLICA_LAG)).scalar())
+
+
+replica_router = None
+if replica_engine is not None:
+    replica_router = ReplicaRouter(
+        _measure_replica_lag,
+        max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval=settings.DB_REPLICA_LAG_CHECK_SECONDS,
+    )
+    register_collector("db_replica", replica_router.stats)
+
+
+@asynccontextmanager
+async def read_session_scope(request: Request):
+    """
+    Session on the read replica when one is configured and close enough to the
+    primary, and on the primary otherwise or when the client just wrote
+    something (see `pin_reads_to_primary`).
+    """
+    pinned = READ_PRIMARY_COOKIE in request.cookies
+    if replica_router is not None and await replica_router.use_replica(pinned):
+        scope = replica_session_scope()
+    else:
+        scope = session_scope()
+    async with scope as db:
         yield db
-    finally:
-        db.close()
+
+
+# Dependency for FastAPI, for routes that only read
+async def get_read_db(request: Request):
+    async with read_session_scope(request) as db:
+        yield db
+
+
+def pin_reads_to_primary(response: Response):
+    """
+    Send the client's reads to the primary for a while after a write, so it
+    reads its own writes even if the replica has not replayed them yet.
+    """
+    if replica_router is None:
+        return
+    response.set_cookie(
+        key=READ_PRIMARY_COOKIE,
+        value="1",
+        max_age=settings.DB_READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        secure=settings.SECURE_COOKIE,
+        samesite=settings.SAME_SITE,
+        path="/",
+    )
+
+
+# Helpers that run a statement on either kind of session, so services can be
+# written once and awaited in both modes.
+
+
+async def db_execute(db: DBSession, statement, params=None):
+    if isinstance(db, AsyncSession):
+        return await db.execute(statement, params)
+    return db.execute(statement, params)
+
+
+async def db_scalar(db: DBSession, statement):
+    """
+    First column of the first row, or None.
+    """
+    return (await db_execute(db, statement)).scalars().first()
+
+
+async def db_scalars(db: DBSession, statement) -> list:
+    return (await db_execute(db, statement)).scalars().all()
+
+
+async def db_commit(db: DBSession):
+    if isinstance(db, AsyncSession):
+        await db.commit()
+    else:
+        db.commit()
+
+
+async def db_rollback(db: DBSession):
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        db.rollback()
+
+
+async def db_refresh(db: DBSession, instance):
+    if isinstance(db, AsyncSession):
+        await db.refresh(instance)
+    else:
+        db.refresh(instance)
+
+
+async def db_delete(db: DBSession, instance):
+    if isinstance(db, AsyncSession):
+        await db.delete(instance)
+    else:
+        db.delete(instance)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    `value` in UTC without tzinfo, the form `DateTime` columns (timestamp
+    without time zone) take. psycopg2 accepts an aware value for them, asyncpg
+    raises on it. Naive values are taken to be UTC already.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utcnow() -> datetime:
+    return naive_utc(datetime.now(timezone.utc))
+
+
+def row_dicts(result) -> list:
+    """
+    Rows of a column select as plain dicts, the cheapest input for pydantic to
+    validate (row mappings and attribute access are several times slower).
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
 
 
 # Function to create tables
 def create_db():
     Base.metadata.create_all(bind=engine)
+
+
+# Function to bring the schema up to date (alembic upgrade head)
+def upgrade_db():
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(SERVICE_ROOT, "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
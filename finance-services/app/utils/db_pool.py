@@ -0,0 +1,96 @@
+"""
+Module: utils.db_pool
+Description:
+    Connection pools that time how long each checkout waits for a connection,
+    so pool exhaustion shows up on `/metrics` instead of as unexplained latency.
+
+Classes:
+    PoolStats:
+        Checkout counters of one pool.
+
+Functions:
+    instrumented_pool(base, name) -> type:
+        Subclass of the pool class `base` that records into a `PoolStats`
+        registered under `name`.
+"""
+
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utils.metrics import register_collector
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.pool = None
+        self._lock = threading.Lock()
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict:
+        stats = {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": (
+                self.wait_seconds_total / self.checkouts * 1000
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_ms_max": self.wait_seconds_max * 1000,
+        }
+
+        pool = self.pool
+        if pool is not None:
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            checked_out = pool.checkedout()
+            stats.update(
+                {
+                    "size": pool.size(),
+                    "checked_out": checked_out,
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                    "saturation": checked_out / capacity if capacity else 0.0,
+                }
+            )
+        return stats
+
+
+def instrumented_pool(base: type, name: str) -> type:
+    """
+    Build a `base` pool subclass whose checkouts are timed into a `PoolStats`.
+
+    The stats live on the class, so they survive the engine recreating its
+    pool (e.g. after `dispose()`).
+    """
+    stats = PoolStats()
+    register_collector(name, stats.stats)
+
+    class InstrumentedPool(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stats.pool = self
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                stats.record(time.perf_counter() - started, timed_out=True)
+                raise
+            stats.record(time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.stats = stats
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
@@ -0,0 +1,83 @@
+"""
+Module: utils.db_replica
+Description:
+    Decides whether a read-only request can be served by the read replica.
+
+    Reads go to the primary when the client just wrote something (it carries
+    the read-your-writes cookie) or when the replica lags behind the primary
+    by more than `max_lag` seconds. The lag is measured at most once every
+    `check_interval` seconds, and a failed measurement counts as lagging.
+
+Classes:
+    ReplicaRouter:
+        Routing decision, cached lag measurement and routing counters.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        measure_lag: Callable[[], Awaitable[float]],
+        max_lag: float,
+        check_interval: float,
+    ):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._measure_lag = measure_lag
+        self._lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+        self.replica_reads = 0
+        self.pinned_reads = 0
+        self.lagging_reads = 0
+
+    def _is_due(self) -> bool:
+        return (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self.check_interval
+        )
+
+    async def lag(self) -> Optional[float]:
+        """
+        Replica lag in seconds as of the last check, None if it could not be
+        measured.
+        """
+        if self._is_due():
+            async with self._lock:
+                if self._is_due():
+                    try:
+                        self._lag = await self._measure_lag()
+                    except Exception as e:
+                        logger.warning(f"Could not measure replica lag: {e}")
+                        self._lag = None
+                    self._checked_at = time.monotonic()
+        return self._lag
+
+    async def use_replica(self, pinned: bool) -> bool:
+        if pinned:
+            self.pinned_reads += 1
+            return False
+
+        lag = await self.lag()
+        if lag is None or lag > self.max_lag:
+            self.lagging_reads += 1
+            return False
+
+        self.replica_reads += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "replica_reads": self.replica_reads,
+            "pinned_reads": self.pinned_reads,
+            "lagging_reads": self.lagging_reads,
+            "lag_seconds": self._lag,
+        }
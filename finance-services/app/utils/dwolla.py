@@ -1,7 +1,11 @@
 import os
-from dwollav2 import Client, Error
+import asyncio
+import functools
+import uuid
 from typing import Optional
 from app.core.config import settings
+from app.utils.metrics import register_collector
+from app.utils.resilience import OutboundPolicy
 
 
 def extractCustomerIdFromUrl(url: str):
@@ -21,12 +25,60 @@ def get_environment() -> str:
     raise ValueError("DWOLLA_ENV must be 'sandbox' or 'production'")
 
 
-# Initialize Dwolla client
-dwolla_client = Client(
-    key=settings.DWOLLA_KEY,
-    secret=settings.DWOLLA_SECRET,
-    environment=get_environment(),
+# Dwolla client, built on first use so the SDK is not imported at boot
+@functools.lru_cache(maxsize=None)
+def get_dwolla_client():
+    from dwollav2 import Client
+
+    return Client(
+        key=settings.DWOLLA_KEY,
+        secret=settings.DWOLLA_SECRET,
+        environment=get_environment(),
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    import requests
+    from dwollav2 import Error
+
+    if isinstance(error, Error):
+        status = getattr(error, "status", None) or 0
+        return status == 429 or status >= 500
+    return isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    )
+
+
+# Every Dwolla request is rate limited, retried on transient errors and
+# rejected with UpstreamUnavailable while the circuit is open. Retried POSTs
+# carry an Idempotency-Key so Dwolla applies them at most once.
+dwolla_policy = OutboundPolicy(
+    "dwolla",
+    rate=settings.DWOLLA_RATE_PER_SECOND,
+    burst=settings.DWOLLA_BURST,
+    is_retryable=_is_retryable,
+    max_attempts=settings.UPSTREAM_RETRY_ATTEMPTS,
+    base_delay=settings.UPSTREAM_RETRY_BASE_DELAY,
+    max_delay=settings.UPSTREAM_RETRY_MAX_DELAY,
+    failure_threshold=settings.UPSTREAM_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.UPSTREAM_CIRCUIT_RESET_SECONDS,
 )
+register_collector("dwolla_policy", dwolla_policy.stats)
+
+
+async def _post(url: str, body: Optional[dict] = None):
+    """
+    POST to Dwolla with an application token under `dwolla_policy`.
+
+    The SDK is synchronous, so each attempt runs in a worker thread; rate limit
+    waits and retry backoff sleep on the event loop without blocking it.
+    """
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    return await dwolla_policy.call(
+        lambda: asyncio.to_thread(
+            lambda: get_dwolla_client().Auth.client().post(url, body, headers)
+        )
+    )
 
 import logging
 from typing import Optional
@@ -38,13 +90,7 @@ logger = logging.getLogger(__name__)
 async def create_dwolla_customer(new_customer: dict) -> Optional[str]:
     logger.info("create_dwolla_customer called")
     try:
-        application_token = dwolla_client.Auth.client()
-        res = dwolla_client.auth_url
-        logger.info(f"Dwolla response: {res}")
-        logger.info(f"res: {res}")
-        logger.info(f"application_token: {application_token}")
-
-        customer_response = application_token.post("customers", new_customer)
+        customer_response = await _post("customers", new_customer)
         customer_url = customer_response.headers["Location"]
         logger.info(
             f"Customer created successfully: {customer_url}, type: {type(customer_url)}"
@@ -64,10 +110,9 @@ async def create_dwolla_customer(new_customer: dict) -> Optional[str]:
     #     raise
 
 
-def create_on_demand_authorization() -> Optional[dict]:
+async def create_on_demand_authorization() -> Optional[dict]:
     try:
-        application_token = dwolla_client.Auth.client()
-        response = application_token.post("on-demand-authorizations")
+        response = await _post("on-demand-authorizations")
 
         # response = dwolla_client.post("on-demand-authorizations")
         return response.body.get("_links")
@@ -75,12 +120,11 @@ def create_on_demand_authorization() -> Optional[dict]:
         print("Creating On Demand Authorization Failed:", e)
 
 
-def create_funding_source(
+async def create_funding_source(
     customer_id: str, funding_source_name: str, plaid_token: str
 ) -> Optional[str]:
     try:
-        application_token = dwolla_client.Auth.client()
-        response = application_token.post(
+        response = await _post(
             f"customers/{customer_id}/funding-sources",
             {"name": funding_source_name, "plaidToken": plaid_token},
         )
@@ -97,7 +141,7 @@ def create_funding_source(
         print("Creating Funding Source Failed:", e)
 
 
-def create_transfer(
+async def create_transfer(
     source_funding_source_url: str, destination_funding_source_url: str, amount: str
 ) -> Optional[str]:
     try:
@@ -108,19 +152,18 @@ def create_transfer(
             },
             "amount": {"currency": "USD", "value": amount},
         }
-        application_token = dwolla_client.Auth.client()
-        res = application_token.post("transfers", request_body)
+        res = await _post("transfers", request_body)
         return res.status
     except Exception as e:
         print("Transfer fund failed:", e)
 
 
-def add_funding_source(
+async def add_funding_source(
     dwolla_customer_id: str, processor_token: str, bank_name: str
 ) -> Optional[str]:
     try:
         print("calling create_on_demand_authorization()")
-        dwolla_auth_links = create_on_demand_authorization()
+        dwolla_auth_links = await create_on_demand_authorization()
         print("finished create_on_demand_authorization()")
 
         print("dwolla_auth_links: ", dwolla_auth_links)
@@ -129,7 +172,7 @@ def add_funding_source(
             raise Exception("Authorization failed.")
 
         print("calling create_funding_source()")
-        funding_source_url = create_funding_source(
+        funding_source_url = await create_funding_source(
             customer_id=dwolla_customer_id,
             funding_source_name=bank_name,
             plaid_token=processor_token,
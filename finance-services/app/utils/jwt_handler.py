@@ -9,17 +9,45 @@ Functions:
     
     verify_token(token: str) -> dict | None:
         Verifies a JWT token and returns its payload if valid, otherwise returns None.
+
+    token_digest(token: str) -> str:
+        SHA-256 hex digest of a token, used to key caches without storing tokens.
 """
 
+import hashlib
+import time
+
 from jose import JWTError, jwt
 from datetime import datetime, timezone, timedelta
 from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.metrics import register_collector
 
 
 SECRET_KEY = settings.ACCESS_TOKEN_SECRET
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+# Payloads of tokens that already passed the signature check, keyed by token
+# digest. Each entry expires with its token's `exp`, and `exp` is checked again
+# on every hit, so an expired token is never served from here.
+verified_tokens = TTLCache(
+    maxsize=settings.JWT_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+register_collector(
+    "jwt_cache",
+    lambda: {
+        "hits": verified_tokens.hits,
+        "misses": verified_tokens.misses,
+        "size": len(verified_tokens),
+    },
+)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """
     Create a JWT access token with an expiration time.
@@ -46,6 +74,8 @@ def verify_token(token: str):
     """
     Verify and decode a JWT token.
 
+    Tokens verified before are served from `verified_tokens` until their `exp`.
+
     Args:
         token (str): The JWT token string to verify.
 
@@ -62,8 +92,22 @@ def verify_token(token: str):
         ... else:
         ...     print("Invalid token")
     """
+    key = token_digest(token)
+    payload = verified_tokens.get(key)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return dict(payload)
+        verified_tokens.invalidate(key)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    # Tokens without a numeric expiry are verified every time
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(exp - time.time(), verified_tokens.ttl)
+        if ttl > 0:
+            verified_tokens.set(key, dict(payload), ttl=ttl)
+    return payload
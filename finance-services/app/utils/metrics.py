@@ -0,0 +1,24 @@
+"""
+Module: utils.metrics
+Description:
+    Minimal in-process metrics registry exposed by the `/metrics` route.
+
+Functions:
+    register_collector(name: str, collector: Callable[[], dict]) -> None:
+        Registers a callable returning a snapshot of some component's counters.
+
+    collect() -> dict:
+        Returns the current snapshot of every registered collector.
+"""
+
+from typing import Callable, Dict
+
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict]):
+    _collectors[name] = collector
+
+
+def collect() -> dict:
+    return {name: collector() for name, collector in _collectors.items()}
@@ -0,0 +1,125 @@
+"""
+Module: utils.password_handler
+Description:
+    Argon2 password hashing off the event loop.
+
+    Hashing and verifying a password is tens of milliseconds of CPU and
+    memory-hard work, so it runs on a small dedicated thread pool (argon2
+    releases the GIL while it hashes). At most `max_workers + max_queue`
+    operations are accepted at a time; past that, calls fail fast with
+    `PasswordHasherBusy` instead of queueing behind a burst of sign-ins.
+
+Classes:
+    PasswordHasherBusy:
+        Raised when the pool is saturated and the operation was not queued.
+
+    PasswordHashPool:
+        Bounded thread pool running `hash` and `verify` for async callers.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from app.core.config import settings
+from app.utils.metrics import register_collector
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Every worker is busy and the queue is full; the operation was not attempted.
+    """
+
+
+class PasswordHashPool:
+    """
+    Run a `PasswordHasher` on a bounded thread pool.
+
+    Args:
+        hasher (PasswordHasher): Hasher carrying the Argon2 cost parameters.
+        max_workers (int): Operations hashing at the same time.
+        max_queue (int): Operations allowed to wait for a worker.
+
+    Example:
+        >>> hashed = await password_pool.hash("SecurePass123")
+        >>> await password_pool.verify(hashed, "SecurePass123")
+        True
+    """
+
+    def __init__(self, hasher: PasswordHasher, max_workers: int, max_queue: int):
+        self.hasher = hasher
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.completed = 0
+        self.rejected = 0
+
+    @functools.cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="argon2"
+        )
+
+    def _release(self, _):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing is saturated")
+            self._pending += 1
+
+        # The slot is released when the work finishes, not when the caller
+        # stops waiting, so cancelled requests still count against the bound
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hasher.hash, password)
+
+    async def verify(self, hashed_password: str, password: str) -> bool:
+        """
+        True if `password` matches the hash, False if it does not or the
+        stored hash is not a valid Argon2 hash.
+        """
+        try:
+            return await self._run(self.hasher.verify, hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+        }
+
+    def shutdown(self):
+        # Nothing to shut down if no password was ever hashed
+        if "_executor" in self.__dict__:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+password_pool = PasswordHashPool(
+    password_hasher,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+register_collector("password_hashing", password_pool.stats)
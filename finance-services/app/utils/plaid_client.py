@@ -1,21 +1,143 @@
 from app.core.config import settings
-import plaid
-from plaid.api import plaid_api
+from app.utils.metrics import register_collector
+from app.utils.resilience import OutboundPolicy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import asyncio
 import base64
+import functools
 
-# Available environments are
-# 'Production'
-# 'Sandbox'
-configuration = plaid.Configuration(
-    host=plaid.Environment.Sandbox,
-    api_key={
-        'clientId': settings.PLAID_CLIENT_ID,
-        'secret': settings.PLAID_SECRET,
-    }
+# The Plaid SDK takes a few hundred milliseconds to import, so it is only
+# imported when the first Plaid call is made, not when the app boots. Services
+# import the `plaid.model` request classes inside the functions that use them.
+
+
+@functools.lru_cache(maxsize=None)
+def get_plaid_api():
+    """
+    The `PlaidApi` client, built on first use.
+    """
+    import plaid
+    from plaid.api import plaid_api
+
+    # Available environments are
+    # 'Production'
+    # 'Sandbox'
+    configuration = plaid.Configuration(
+        host=plaid.Environment.Sandbox,
+        api_key={
+            'clientId': settings.PLAID_CLIENT_ID,
+            'secret': settings.PLAID_SECRET,
+        }
+    )
+    # One pooled connection per executor thread
+    configuration.connection_pool_maxsize = settings.PLAID_MAX_WORKERS
+
+    return plaid_api.PlaidApi(plaid.ApiClient(configuration))
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    RATE_LIMIT_EXCEEDED (429), 5xx responses and network errors are transient.
+    """
+    import urllib3
+    from plaid.exceptions import ApiException
+
+    if isinstance(error, ApiException):
+        return error.status == 429 or (error.status or 0) >= 500
+    return isinstance(
+        error, (urllib3.exceptions.HTTPError, ConnectionError, TimeoutError)
+    )
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    try:
+        return float(headers.get("Retry-After")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+plaid_policy = OutboundPolicy(
+    "plaid",
+    rate=settings.PLAID_RATE_PER_SECOND,
+    burst=settings.PLAID_BURST,
+    key_rate=settings.PLAID_ITEM_RATE_PER_SECOND,
+    key_burst=settings.PLAID_ITEM_BURST,
+    is_retryable=_is_retryable,
+    retry_after=_retry_after,
+    max_attempts=settings.UPSTREAM_RETRY_ATTEMPTS,
+    base_delay=settings.UPSTREAM_RETRY_BASE_DELAY,
+    max_delay=settings.UPSTREAM_RETRY_MAX_DELAY,
+    failure_threshold=settings.UPSTREAM_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.UPSTREAM_CIRCUIT_RESET_SECONDS,
 )
+register_collector("plaid_policy", plaid_policy.stats)
+
+
+# Calls whose effect is lost if they are repeated. A public token can only be
+# exchanged once, so retrying an exchange that timed out after it succeeded
+# fails with INVALID_PUBLIC_TOKEN and loses the linked item.
+NON_IDEMPOTENT_CALLS = frozenset({"item_public_token_exchange"})
 
-api_client = plaid.ApiClient(configuration)
-client = plaid_api.PlaidApi(api_client)
+
+class AsyncPlaidApi:
+    """
+    Awaitable facade over `PlaidApi`.
+
+    The generated Plaid client is synchronous, so every call is run on a bounded
+    thread pool instead of the event loop. `api` returns the client; it and the
+    thread pool are only created by the first call.
+    `await async_client.accounts_get(req)` takes the same arguments as
+    `get_plaid_api().accounts_get(req)`.
+
+    Every call goes through `plaid_policy`: rate limited for the whole client and
+    per item (keyed by the request's access token), retried on transient errors
+    and rejected with `UpstreamUnavailable` while the circuit is open.
+    `NON_IDEMPOTENT_CALLS` are never retried.
+    """
+
+    def __init__(
+        self, api: Callable[[], object], max_workers: int, policy: OutboundPolicy
+    ):
+        self._api = api
+        self._policy = policy
+        self._max_workers = max_workers
+
+    @functools.cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="plaid"
+        )
+
+    def __getattr__(self, name):
+        method = getattr(self._api(), name)
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            request = args[0] if args else None
+            item_key = request.get("access_token") if request is not None else None
+
+            return await self._policy.call(
+                lambda: loop.run_in_executor(
+                    self._executor, functools.partial(method, *args, **kwargs)
+                ),
+                key=item_key,
+                retry=name not in NON_IDEMPOTENT_CALLS,
+            )
+
+        return call
+
+    def shutdown(self):
+        # Nothing to shut down if no call was ever made
+        if "_executor" in self.__dict__:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async_client = AsyncPlaidApi(
+    get_plaid_api, max_workers=settings.PLAID_MAX_WORKERS, policy=plaid_policy
+)
 
 # TODO: Move these methods
 def encrypt_id(id: str) -> str:
@@ -0,0 +1,105 @@
+"""
+Module: utils.plaid_projection
+Description:
+    Projects Plaid response models onto the handful of fields we store.
+
+    Calling `.to_dict()` on a Plaid response recursively converts every nested
+    model (location, counterparties, payment meta, categories, ...) into dicts
+    only for us to pick ten fields back out. These helpers read the fields
+    straight off the models into compact slotted records instead.
+
+Classes:
+    TransactionRecord: Mirrored fields of a Plaid transaction.
+    AccountRecord: Metadata and balances of a Plaid account.
+
+Functions:
+    project_transaction(transaction) -> TransactionRecord
+    project_account(account) -> AccountRecord
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+
+@dataclass(slots=True, frozen=True)
+class TransactionRecord:
+    transaction_id: str
+    account_id: str
+    name: Optional[str]
+    amount: float
+    date: Optional[date]
+    category: Optional[str]
+    payment_channel: Optional[str]
+    pending: Optional[bool]
+    image: Optional[str]
+
+    def mirror_fields(self) -> dict:
+        """
+        Column values of the `plaid_transactions` row for this transaction.
+        """
+        return {
+            "account_id": self.account_id,
+            "name": self.name,
+            "amount": self.amount,
+            "date": self.date,
+            "category": self.category,
+            "payment_channel": self.payment_channel,
+            "pending": self.pending,
+            "image": self.image,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class AccountRecord:
+    account_id: str
+    name: Optional[str]
+    official_name: Optional[str]
+    mask: Optional[str]
+    type: Optional[str]
+    subtype: Optional[str]
+    available_balance: Optional[float]
+    current_balance: Optional[float]
+
+
+def project_transaction(transaction) -> TransactionRecord:
+    """
+    Project a Plaid `Transaction` model without converting it to a dict.
+    """
+    get = transaction.get
+    personal_finance_category = get("personal_finance_category")
+
+    return TransactionRecord(
+        transaction_id=transaction.transaction_id,
+        account_id=transaction.account_id,
+        name=get("name"),
+        amount=transaction.amount,
+        date=get("date"),
+        category=(
+            personal_finance_category.primary if personal_finance_category else ""
+        ),
+        payment_channel=get("payment_channel"),
+        pending=get("pending"),
+        image=get("logo_url"),
+    )
+
+
+def project_account(account) -> AccountRecord:
+    """
+    Project a Plaid `AccountBase` model without converting it to a dict.
+    """
+    get = account.get
+    balances = account.balances
+    account_type = get("type")
+    account_subtype = get("subtype")
+
+    return AccountRecord(
+        account_id=account.account_id,
+        name=get("name"),
+        official_name=get("official_name"),
+        mask=get("mask"),
+        type=str(account_type) if account_type is not None else None,
+        subtype=str(account_subtype) if account_subtype is not None else None,
+        available_balance=balances.get("available"),
+        current_balance=balances.get("current"),
+    )
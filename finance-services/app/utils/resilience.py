@@ -0,0 +1,243 @@
+"""
+Module: utils.resilience
+Description:
+    Outbound call policy shared by the Plaid and Dwolla clients: token-bucket
+    rate limits, jittered exponential retry and a circuit breaker.
+
+Classes:
+    UpstreamUnavailable:
+        Raised without calling upstream while its circuit breaker is open.
+    TokenBucket:
+        Rate limiter that hands out one token per call.
+    CircuitBreaker:
+        Fails fast after repeated upstream failures, probing again later.
+    OutboundPolicy:
+        Combines the three around a single async upstream call.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from app.utils.cache import TTLCache
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailable(Exception):
+    """
+    The upstream is considered degraded and the call was not attempted.
+    """
+
+
+# ================================================
+# Rate Limiting
+# ================================================
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+
+    Callers reserve a token and wait until it is due, so bursts up to
+    `capacity` go straight through and anything beyond is smoothed to `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how many seconds to wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+# ================================================
+# Circuit Breaker
+# ================================================
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds. Then a single probe call is let through; its
+    outcome closes the circuit again or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.CLOSED:
+                return
+
+            # While open, and while a probe is in flight, reject; a probe that
+            # never reported back is replaced after another reset_timeout.
+            if now - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise UpstreamUnavailable(f"{self.name} circuit is {self.state}")
+
+            self.state = self.HALF_OPEN
+            self._opened_at = now
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != self.CLOSED
+
+
+# ================================================
+# Outbound Policy
+# ================================================
+
+
+class OutboundPolicy:
+    """
+    Rate limit, retry and circuit-break calls to one upstream.
+
+    Args:
+        name (str): Upstream name, used in errors and metrics.
+        rate / burst: Token bucket shared by every call to the upstream.
+        key_rate / key_burst: Token bucket per key (e.g. per Plaid item).
+        is_retryable (callable): Whether an exception is a transient upstream
+                                 failure. Only those are retried and counted
+                                 by the circuit breaker.
+        retry_after (callable, optional): Server-requested delay for an exception.
+        max_attempts, base_delay, max_delay: Exponential backoff with full jitter.
+        failure_threshold, reset_timeout: Circuit breaker settings.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        is_retryable: Callable[[Exception], bool],
+        key_rate: Optional[float] = None,
+        key_burst: Optional[float] = None,
+        retry_after: Optional[Callable[[Exception], Optional[float]]] = None,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.is_retryable = is_retryable
+        self.retry_after = retry_after
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.bucket = TokenBucket(rate, burst)
+        self.key_rate = key_rate
+        self.key_burst = key_burst
+        self._key_buckets = TTLCache(maxsize=10000, ttl=3600)
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+
+        self.calls = 0
+        self.retries = 0
+
+    def _wait_for_tokens(self, key: Optional[Hashable]) -> float:
+        wait = self.bucket.reserve()
+        if key is not None and self.key_rate:
+            bucket = self._key_buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.key_rate, self.key_burst or self.key_rate)
+                self._key_buckets.set(key, bucket)
+            wait = max(wait, bucket.reserve())
+        return wait
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        requested = self.retry_after(error) if self.retry_after else None
+        return max(delay, min(requested or 0, self.max_delay))
+
+    def _should_retry(self, attempt: int, attempts: int, error: Exception) -> bool:
+        """
+        Record the failed attempt and decide whether to try again.
+        """
+        if not self.is_retryable(error):
+            # The upstream answered; the request itself was at fault
+            self.breaker.record_success()
+            return False
+
+        self.breaker.record_failure()
+        return attempt < attempts and not self.breaker.is_open
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        key: Optional[Hashable] = None,
+        retry: bool = True,
+    ) -> T:
+        """
+        Await `fn()` under the policy. `fn` is called again for every attempt.
+        Calls that are not safe to repeat pass `retry=False`: they are still
+        rate limited and counted by the circuit breaker, but attempted once.
+        """
+        self.breaker.before_call()
+        self.calls += 1
+
+        attempts = self.max_attempts if retry else 1
+        for attempt in range(1, attempts + 1):
+            wait = self._wait_for_tokens(key)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                result = await fn()
+            except Exception as e:
+                if not self._should_retry(attempt, attempts, e):
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, e))
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "rejected": self.breaker.rejected,
+        }
@@ -0,0 +1,66 @@
+"""
+Module: utils.singleflight
+Description:
+    Coalesces identical concurrent async calls into a single execution.
+
+Classes:
+    SingleFlight:
+        Runs at most one call per key at a time and shares its result with
+        every caller that asks for the same key while it is in flight.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.utils.metrics import register_collector
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> response = await flight.do(("accounts_get", item_id), fetch)
+    """
+
+    def __init__(self):
+        self.issued = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await `fn()`, or the call already running under `key` if there is one.
+
+        The shared call is shielded, so one caller being cancelled does not
+        cancel it for the others.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.issued += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "issued": self.issued,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+# Shared by every service that calls Plaid; keys are (operation, item, ...)
+plaid_flight = SingleFlight()
+register_collector("plaid_singleflight", plaid_flight.stats)
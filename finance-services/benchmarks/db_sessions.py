@@ -0,0 +1,89 @@
+"""
+Benchmark: sync (psycopg2) vs async (asyncpg) sessions under concurrency.
+
+Runs `--requests` concurrent coroutines on one event loop, each issuing a
+query that takes `--query-ms` on the server, once through a sync `Session`
+and once through an `AsyncSession`. Reports the wall time and the worst event
+loop stall, measured by a ticker that should wake every millisecond.
+
+Needs a reachable Postgres (the POSTGRES_* settings).
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.db_sessions [--requests 50] [--query-ms 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.utils.database import db_execute
+
+
+async def measure(make_session, requests: int, query_ms: int):
+    statement = text("SELECT pg_sleep(:seconds)")
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - started - 0.001)
+
+    async def request():
+        db = make_session()
+        try:
+            await db_execute(db, statement, {"seconds": query_ms / 1000})
+        finally:
+            result = db.close()
+            if asyncio.iscoroutine(result):
+                await result
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticking
+    return elapsed, stall
+
+
+async def run(args):
+    pool = {"pool_size": args.requests, "max_overflow": 0}
+    sync_engine = create_engine(settings.postgres_database_url, **pool)
+    async_engine = create_async_engine(settings.postgres_async_database_url, **pool)
+
+    sessions = (
+        ("Session", sessionmaker(bind=sync_engine)),
+        ("AsyncSession", async_sessionmaker(bind=async_engine)),
+    )
+    print(f"{args.requests} concurrent requests, {args.query_ms} ms query each")
+    try:
+        for label, make_session in sessions:
+            # Warm the pool so connection setup is not measured
+            await measure(make_session, args.requests, 0)
+            elapsed, stall = await measure(make_session, args.requests, args.query_ms)
+            print(
+                f"  {label:<13} {elapsed * 1000:8.1f} ms total"
+                f"  {stall * 1000:8.1f} ms worst loop stall"
+            )
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--query-ms", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Check: `import app.main` stays within its import-time budget.
+
+Imports the app in a fresh interpreter under `python -X importtime` and fails
+if the cumulative import time of `app.main` exceeds `--budget-ms` (the best
+of `--runs` runs, to keep disk cache noise out), or if any of the SDKs that
+are meant to be imported on first use (`LAZY_MODULES`) got imported at boot.
+Prints the import time spent per top-level package either way.
+
+Does not need a database: importing the app opens no connections.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.import_time [--budget-ms 1200] [--runs 3]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Imported by the first call that needs them, never at boot
+LAZY_MODULES = ("plaid", "dwollav2", "alembic")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure() -> list:
+    """
+    (self microseconds, cumulative microseconds, depth, module) of every
+    module imported by the interpreter, in the order `-X importtime` lists them.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode:
+        sys.exit(completed.stderr)
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            imports.append((int(own), int(cumulative), len(indent) // 2, module))
+    return imports
+
+
+def app_imports(imports: list) -> list:
+    """
+    The imports made by `import app.main`, ending with app.main itself.
+    Modules are listed after the modules they import.
+    """
+    end = next(i for i, entry in enumerate(imports) if entry[3] == "app.main")
+    start = end
+    while start > 0 and imports[start - 1][2] > 0:
+        start -= 1
+    return imports[start : end + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=1200)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    imports = min(map(app_imports, runs), key=lambda imports: imports[-1][1])
+    total_ms = imports[-1][1] / 1000
+
+    print(f"  import app.main: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    packages = defaultdict(int)
+    for own, _, _, module in imports:
+        packages[module.split(".")[0]] += own
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    for package, us in slowest[: args.top]:
+        print(f"    {us / 1000:8.1f} ms  {package}")
+
+    eager = sorted(
+        {
+            module
+            for _, _, _, module in imports
+            if module.split(".")[0] in LAZY_MODULES
+        }
+    )
+    if eager:
+        print(f"  imported at boot, should be lazy: {', '.join(eager)}")
+
+    sys.exit(1 if eager or total_ms > args.budget_ms else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: bulk ingestion of mirror transactions, rows per second.
+
+Ingests `--rows` synthetic Plaid transactions for a throwaway item, once one
+ORM row per `add` (flushed per row, as the single-row write paths do) and
+once through `ingest_transactions` in batches of multi-row upserts. The
+batched run is repeated over the same rows to measure the idempotent update
+path. Everything runs in a transaction that is rolled back at the end.
+
+Needs a reachable Postgres (the POSTGRES_* settings) migrated to head.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.ingest [--rows 20000] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.plaid import PlaidItem, PlaidTransaction
+from app.services.transaction_service import ingest_transactions
+from app.utils.plaid_projection import TransactionRecord
+
+ITEM_ID = "benchmark-ingest-item"
+
+
+def records(rows: int, prefix: str):
+    start = date(2024, 1, 1)
+    for i in range(rows):
+        yield TransactionRecord(
+            transaction_id=f"{prefix}-{i}",
+            account_id="benchmark-account",
+            name=f"Merchant {i % 97}",
+            amount=round((i % 500) / 7, 2),
+            date=start + timedelta(days=i % 365),
+            category="FOOD_AND_DRINK",
+            payment_channel="online",
+            pending=False,
+            image=None,
+        )
+
+
+def timed(label: str, rows: int, run):
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(
+        f"  {label:<24} {rows:>8} rows  {elapsed:7.2f}s"
+        f"  {rows / elapsed:10.0f} rows/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.postgres_database_url)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection)
+        item = PlaidItem(item_id=ITEM_ID)
+        db.add(item)
+        db.flush()
+
+        def row_by_row():
+            for record in records(args.rows, "row"):
+                db.add(
+                    PlaidTransaction(
+                        transaction_id=record.transaction_id,
+                        item_id=ITEM_ID,
+                        **record.mirror_fields(),
+                    )
+                )
+                db.flush()
+
+        def batched():
+            asyncio.run(
+                ingest_transactions(
+                    item, records(args.rows, "bulk"), db, args.batch_size
+                )
+            )
+
+        timed("row by row", args.rows, row_by_row)
+        timed(f"batched ({args.batch_size})", args.rows, batched)
+        timed("batched, re-ingest", args.rows, batched)
+
+        db.close()
+        transaction.rollback()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
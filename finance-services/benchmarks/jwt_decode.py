@@ -0,0 +1,72 @@
+"""
+Benchmark: cost of verifying the session cookie's JWT, with and without the
+verified-token cache.
+
+    decode    `jose.jwt.decode` with the signature check (every request before
+              the cache)
+    cold      `verify_token` on a token it has not seen (decode + cache fill)
+    cached    `verify_token` on a token it verified before
+
+Also checks that a cached token stops being returned once its `exp` passes.
+
+Does not need a database.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.jwt_decode [--calls 20000]
+"""
+
+import argparse
+import time
+from datetime import timedelta
+
+from jose import jwt
+
+from app.utils.jwt_handler import (
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    verified_tokens,
+    verify_token,
+)
+
+
+def per_call_us(fn, tokens: list) -> float:
+    started = time.perf_counter()
+    for token in tokens:
+        assert fn(token) is not None
+    return (time.perf_counter() - started) / len(tokens) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token({"user_id": "1"})
+    # Distinct tokens so every cold call misses the cache
+    fresh = [
+        create_access_token({"user_id": str(i)})
+        for i in range(min(args.calls, verified_tokens.maxsize))
+    ]
+
+    decode = per_call_us(
+        lambda t: jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]),
+        [token] * args.calls,
+    )
+    verified_tokens.clear()
+    cold = per_call_us(verify_token, fresh)
+    verify_token(token)
+    cached = per_call_us(verify_token, [token] * args.calls)
+
+    for name, us in (("decode", decode), ("cold", cold), ("cached", cached)):
+        print(f"  {name:<7} {us:8.2f} us/call  x{decode / us:.1f}")
+
+    expiring = create_access_token({"user_id": "1"}, timedelta(seconds=1))
+    assert verify_token(expiring) is not None
+    time.sleep(1.1)
+    assert verify_token(expiring) is None
+    print("  expired token rejected after caching: ok")
+
+
+if __name__ == "__main__":
+    main()
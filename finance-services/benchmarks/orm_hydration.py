@@ -0,0 +1,106 @@
+"""
+Benchmark: ORM entity loads vs column-projected rows, per-row cost.
+
+Reads `--rows` banks of one user into `BankResponse`s three ways:
+    orm       select(Bank) entities, `model_validate` per object (the old path)
+    columns   the response columns only, `model_validate` per row
+    adapter   the response columns only as dicts, one `TypeAdapter` pass
+              (getBanks)
+
+The rows live in an in-memory SQLite database: the point is the Python side
+of a read (entity hydration, identity map, validation), which does not depend
+on the database behind it.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.orm_hydration [--rows 5000] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models.bank import Bank
+from app.models.user import User
+from app.schemas.bank import BankResponse, BankResponseList
+from app.services.bank_service import BANK_RESPONSE_COLUMNS
+from app.utils.database import Base, row_dicts
+
+USER_ID = 1
+
+
+def seed(engine, rows: int):
+    Base.metadata.create_all(engine, tables=[User.__table__, Bank.__table__])
+    with Session(engine) as db:
+        db.add(
+            User(
+                id=USER_ID,
+                first_name="Bench",
+                last_name="Mark",
+                email="bench@example.com",
+                hashed_password="-",
+            )
+        )
+        db.add_all(
+            Bank(
+                user_id=USER_ID,
+                bank_id=f"item-{i // 4}",
+                account_id=f"account-{i}",
+                access_token=f"token-{i}",
+                funding_source_url=None,
+                shareable_id=f"shareable-{i}",
+            )
+            for i in range(rows)
+        )
+        db.commit()
+
+
+def orm(db):
+    banks = db.scalars(select(Bank).where(Bank.user_id == USER_ID)).all()
+    return [BankResponse.model_validate(bank) for bank in banks]
+
+
+def columns(db):
+    rows = db.execute(
+        select(*BANK_RESPONSE_COLUMNS).where(Bank.user_id == USER_ID)
+    ).all()
+    return [BankResponse.model_validate(row) for row in rows]
+
+
+def adapter(db):
+    rows = db.execute(select(*BANK_RESPONSE_COLUMNS).where(Bank.user_id == USER_ID))
+    return BankResponseList.validate_python(row_dicts(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    seed(engine, args.rows)
+
+    baseline = None
+    for name, read in (("orm", orm), ("columns", columns), ("adapter", adapter)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            # A fresh session per request, as in the app
+            with Session(engine) as db:
+                started = time.perf_counter()
+                result = read(db)
+                best = min(best, time.perf_counter() - started)
+        assert len(result) == args.rows
+
+        per_row_us = best / args.rows * 1e6
+        baseline = baseline or per_row_us
+        print(
+            f"  {name:<8} {per_row_us:6.2f} us/row"
+            f"  {best * 1000:8.2f} ms total  x{baseline / per_row_us:.2f}"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: sign-in password verification throughput and event loop stalls.
+
+Runs a burst of `--logins` concurrent Argon2 verifications with the configured
+cost parameters (ARGON2_*) two ways:
+    inline    `PasswordHasher.verify` called directly in the coroutine (the
+              old sign-in path)
+    pool      `PasswordHashPool.verify` with 1..`--workers` threads
+
+and reports verifications per second, per second per core in use (worker
+threads, capped at the number of CPUs), and the longest the event loop went
+without running a 1 ms ticker while the burst was in flight: the delay every
+other request on the worker would have seen.
+
+Does not need a database.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.password_hashing [--logins 64] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import time
+
+from app.utils.password_handler import PasswordHashPool, password_hasher
+
+PASSWORD = "SecurePass123"
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    """Longest gap between 1 ms ticks, in milliseconds."""
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+    return worst * 1000
+
+
+async def burst(verify, logins: int):
+    stop = asyncio.Event()
+    ticks = asyncio.create_task(ticker(stop))
+    await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    assert all(results)
+    return elapsed, await ticks
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    hashed = password_hasher.hash(PASSWORD)
+    print(
+        f"  argon2 t={password_hasher.time_cost} m={password_hasher.memory_cost} KiB"
+        f" p={password_hasher.parallelism}, {args.logins} logins,"
+        f" {os.cpu_count()} cpus"
+    )
+
+    async def inline():
+        return password_hasher.verify(hashed, PASSWORD)
+
+    runs = [("inline", 1, inline)]
+    workers = 1
+    while workers <= args.workers:
+        pool = PasswordHashPool(password_hasher, workers, max_queue=args.logins)
+        verify = functools.partial(pool.verify, hashed, PASSWORD)
+        runs.append((f"pool x{workers}", workers, verify))
+        workers *= 2
+
+    for name, threads, verify in runs:
+        elapsed, stall_ms = await burst(verify, args.logins)
+        rate = args.logins / elapsed
+        cores = min(threads, os.cpu_count() or 1)
+        print(
+            f"  {name:<9} {rate:7.1f} logins/s  {rate / cores:7.1f} per core"
+            f"  max loop stall {stall_ms:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+"""
+Benchmark: projecting `/transactions/sync` pages vs `.to_dict()`.
+
+Builds a synthetic sync page of fully populated Plaid `Transaction` models and
+compares, per page, the CPU time and peak allocations of the old path
+(`response.to_dict()` then picking fields) with `project_transaction`.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.plaid_projection [--transactions 500] [--rounds 20]
+"""
+
+import argparse
+import copy
+import timeit
+import tracemalloc
+
+import plaid
+from plaid.model.transactions_sync_response import TransactionsSyncResponse
+from plaid.model_utils import validate_and_convert_types
+
+from app.utils.plaid_projection import project_transaction
+
+
+TRANSACTION = {
+    "account_id": "BxBXxLj1m4HMXBm9WZZmCWVbPjX16EHwv99vp",
+    "account_owner": None,
+    "amount": 72.1,
+    "iso_currency_code": "USD",
+    "unofficial_currency_code": None,
+    "category": ["Shops", "Supermarkets and Groceries"],
+    "category_id": "19046000",
+    "check_number": None,
+    "counterparties": [
+        {
+            "name": "Walmart",
+            "type": "merchant",
+            "logo_url": "https://plaid-merchant-logos.plaid.com/walmart_1100.png",
+            "website": "walmart.com",
+            "entity_id": "O5W5j4dN9OR3E6ypQmjdkWZZRoXEzVMz2ByWM",
+            "confidence_level": "VERY_HIGH",
+        }
+    ],
+    "date": "2023-09-24",
+    "datetime": "2023-09-24T11:01:01Z",
+    "authorized_date": "2023-09-22",
+    "authorized_datetime": "2023-09-22T10:34:50Z",
+    "location": {
+        "address": "13425 Community Rd",
+        "city": "Poway",
+        "region": "CA",
+        "postal_code": "92064",
+        "country": "US",
+        "lat": 32.959068,
+        "lon": -117.037666,
+        "store_number": "1700",
+    },
+    "merchant_name": "Walmart",
+    "merchant_entity_id": "O5W5j4dN9OR3E6ypQmjdkWZZRoXEzVMz2ByWM",
+    "logo_url": "https://plaid-merchant-logos.plaid.com/walmart_1100.png",
+    "website": "walmart.com",
+    "name": "PURCHASE WM SUPERCENTER #1700",
+    "payment_meta": {
+        "by_order_of": None,
+        "payee": None,
+        "payer": None,
+        "payment_method": None,
+        "payment_processor": None,
+        "ppd_id": None,
+        "reason": None,
+        "reference_number": None,
+    },
+    "payment_channel": "in store",
+    "pending": False,
+    "pending_transaction_id": None,
+    "personal_finance_category": {
+        "primary": "GENERAL_MERCHANDISE",
+        "detailed": "GENERAL_MERCHANDISE_SUPERSTORES",
+        "confidence_level": "VERY_HIGH",
+    },
+    "personal_finance_category_icon_url": "https://plaid-category-icons.plaid.com/PFC_GENERAL_MERCHANDISE.png",
+    "transaction_id": "lPNjeW1nR6CDn5okmGQ6hEpMo4lLNoSrzqDje",
+    "transaction_code": None,
+    "transaction_type": "place",
+}
+
+
+def build_page(size: int) -> TransactionsSyncResponse:
+    added = []
+    for i in range(size):
+        transaction = copy.deepcopy(TRANSACTION)
+        transaction["transaction_id"] = f"txn-{i}"
+        added.append(transaction)
+
+    raw = {
+        "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+        "accounts": [],
+        "added": added,
+        "modified": [],
+        "removed": [],
+        "next_cursor": "cursor",
+        "has_more": False,
+        "request_id": "request",
+    }
+    return validate_and_convert_types(
+        raw,
+        (TransactionsSyncResponse,),
+        ["received_data"],
+        True,
+        True,
+        configuration=plaid.Configuration(),
+    )
+
+
+def with_to_dict(page):
+    data = page.to_dict()
+    return [
+        {
+            "transaction_id": transaction.get("transaction_id"),
+            "account_id": transaction.get("account_id"),
+            "name": transaction.get("name"),
+            "amount": transaction.get("amount"),
+            "date": transaction.get("date"),
+            "category": (
+                transaction.get("personal_finance_category", {}).get("primary")
+                if transaction.get("personal_finance_category")
+                else ""
+            ),
+            "payment_channel": transaction.get("payment_channel"),
+            "pending": transaction.get("pending"),
+            "image": transaction.get("logo_url"),
+        }
+        for transaction in data.get("added", [])
+    ]
+
+
+def with_projection(page):
+    return [project_transaction(transaction) for transaction in page.added]
+
+
+def peak_allocated(fn, page) -> int:
+    tracemalloc.start()
+    result = fn(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    page = build_page(args.transactions)
+    print(f"Sync page with {args.transactions} transactions, {args.rounds} rounds")
+
+    for label, fn in (("to_dict()", with_to_dict), ("projection", with_projection)):
+        seconds = min(timeit.repeat(lambda: fn(page), number=1, repeat=args.rounds))
+        peak = peak_allocated(fn, page)
+        print(
+            f"  {label:<11} {seconds * 1000:8.2f} ms/page"
+            f"  {peak / 1024:10.1f} KiB peak allocated"
+        )
+
+
+if __name__ == "__main__":
+    main()
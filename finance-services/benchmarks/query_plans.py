@@ -0,0 +1,107 @@
+"""
+Check: hot read queries are served by indexes.
+
+Runs EXPLAIN for the bank and transaction lookups made on every account
+request and fails if any of them falls back to a sequential scan. Sequential
+scans are disabled for the session, so the check holds on a small or empty
+database too: it asks whether a usable index exists, not what the planner
+prefers at the current table sizes.
+
+It also EXPLAINs date-bounded transfer history reads and fails unless the
+plan is pruned to the monthly `transactions` partitions of the range.
+(Spending summaries read the rollups and never touch `transactions`.)
+
+Needs a reachable Postgres (the POSTGRES_* settings) migrated to head.
+
+Usage (from finance-services/, with the app's environment variables set):
+    python -m benchmarks.query_plans
+"""
+
+import argparse
+import re
+import sys
+from datetime import date
+
+from sqlalchemy import create_engine, select
+
+from app.core.config import settings
+from app.models.bank import Bank
+from app.services.ledger_service import ledger_query
+from app.services.transaction_service import (
+    _account_transactions_query,
+    _history_transfers,
+)
+
+
+def queries():
+    user_id, bank_id = 1, 1
+    return {
+        "getBanks": select(Bank).where(Bank.user_id == user_id),
+        "getBank": select(Bank).where(Bank.shareable_id == "shareable"),
+        "item banks": select(Bank).where(Bank.bank_id == "item"),
+        "ledger by user and bank": ledger_query(user_id, bank_id),
+        "ledger by user": ledger_query(user_id),
+        "account history": _account_transactions_query("item", "account"),
+    }
+
+
+def pruned_queries():
+    """
+    Date-bounded reads, with the partitions their plans may touch.
+    """
+    user_id = 1
+    return {
+        "history, one month": (
+            _history_transfers(
+                user_id, None, None, date(2024, 3, 1), date(2024, 3, 31), 50
+            ),
+            {"transactions_2024_03"},
+        ),
+        "history, two months": (
+            _history_transfers(
+                user_id, None, None, date(2024, 3, 15), date(2024, 4, 15), 50
+            ),
+            {"transactions_2024_03", "transactions_2024_04"},
+        ),
+    }
+
+
+def explain(connection, engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    return "\n".join(
+        row[0] for row in connection.exec_driver_sql(f"EXPLAIN {compiled}")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--verbose", action="store_true", help="print the plans")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.postgres_database_url)
+    failures = 0
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        for name, statement in queries().items():
+            plan = explain(connection, engine, statement)
+            ok = "Seq Scan" not in plan
+            failures += not ok
+            print(f"  {'ok ' if ok else 'SEQ'} {name}")
+            if args.verbose or not ok:
+                print("      " + plan.replace("\n", "\n      "))
+
+        for name, (statement, allowed) in pruned_queries().items():
+            plan = explain(connection, engine, statement)
+            scanned = set(re.findall(r"\btransactions_\d{4}_\d{2}\b", plan))
+            ok = scanned <= allowed
+            failures += not ok
+            print(f"  {'ok ' if ok else 'ALL'} {name}: {', '.join(sorted(scanned))}")
+            if args.verbose or not ok:
+                print("      " + plan.replace("\n", "\n      "))
+    engine.dispose()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
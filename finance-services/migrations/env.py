@@ -0,0 +1,78 @@
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool, text
+
+from alembic import context
+
+from app.core.config import settings
+from app.utils.database import Base
+
+# Register every model on Base.metadata
+import app.models.user  # noqa: F401
+import app.models.bank  # noqa: F401
+import app.models.transactions  # noqa: F401
+import app.models.plaid  # noqa: F401
+import app.models.spending  # noqa: F401
+
+config = context.config
+
+# Only configure logging when run from the alembic CLI; the app has its own
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Every app worker runs the migrations on boot. They hold this transaction-level
+# advisory lock while migrating, so one worker migrates and the others wait
+# for it and then find the schema already at head.
+MIGRATION_LOCK_KEY = 0x6D6967726174  # "migrat"
+
+
+def run_migrations_offline() -> None:
+    """
+    Emit the migration SQL to stdout instead of running it.
+    """
+    context.configure(
+        url=settings.postgres_database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """
+    Run the migrations on a dedicated connection, outside the app's pool and
+    its statement timeout. A caller may pass its own `connection` attribute.
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_migrations(connection)
+        return
+
+    connectable = create_engine(settings.postgres_database_url, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        _run_migrations(connection)
+
+
+def _run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": MIGRATION_LOCK_KEY},
+            )
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,205 @@
+"""Initial schema with query indexes
+
+Creates every table the app used to build with `Base.metadata.create_all`,
+plus indexes matching the real query shapes: transfers by user or bank newest
+first, banks by user / Plaid item / shareable ID, and the per-account Plaid
+transaction history.
+
+Databases created by the old startup `create_all` already have the tables;
+those are left as they are and only the missing indexes are added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_table(name: str, *columns):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+
+
+def _create_index(name: str, table: str, columns: list, unique: bool = False):
+    op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("first_name", sa.String(length=50), nullable=False),
+        sa.Column("last_name", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("address1", sa.String(length=255), nullable=True),
+        sa.Column("city", sa.String(length=50), nullable=True),
+        sa.Column("state", sa.String(length=50), nullable=True),
+        sa.Column("postal_code", sa.String(length=10), nullable=True),
+        sa.Column("date_of_birth", sa.String(length=10), nullable=True),
+        sa.Column("ssn", sa.String(), nullable=True),
+        sa.Column("dwolla_customer_id", sa.String(length=100), nullable=True),
+        sa.Column("dwolla_customer_url", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_table(
+        "banks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("bank_id", sa.String(length=100), nullable=True),
+        sa.Column("account_id", sa.String(length=100), nullable=True),
+        sa.Column("access_token", sa.String(), nullable=True),
+        sa.Column("funding_source_url", sa.String(length=255), nullable=True),
+        sa.Column("shareable_id", sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=True),
+        sa.Column("sender_id", sa.Integer(), nullable=True),
+        sa.Column("receiver_id", sa.Integer(), nullable=True),
+        sa.Column("sender_bank_id", sa.Integer(), nullable=True),
+        sa.Column("receiver_bank_id", sa.Integer(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=True),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("channel", sa.String(length=50), nullable=True),
+        sa.Column("pending", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["receiver_bank_id"], ["banks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["receiver_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sender_bank_id"], ["banks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sender_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_table(
+        "plaid_items",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("item_id", sa.String(length=100), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("institution_id", sa.String(length=100), nullable=True),
+        sa.Column("cursor", sa.String(), nullable=True),
+        sa.Column("transactions_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("balances_synced_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_table(
+        "plaid_accounts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.String(length=100), nullable=False),
+        sa.Column("item_id", sa.String(length=100), nullable=False),
+        sa.Column("institution_id", sa.String(length=100), nullable=True),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("official_name", sa.String(length=255), nullable=True),
+        sa.Column("mask", sa.String(length=10), nullable=True),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("subtype", sa.String(length=50), nullable=True),
+        sa.Column("available_balance", sa.Float(), nullable=True),
+        sa.Column("current_balance", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_table(
+        "plaid_transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("transaction_id", sa.String(length=100), nullable=False),
+        sa.Column("item_id", sa.String(length=100), nullable=False),
+        sa.Column("account_id", sa.String(length=100), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("payment_channel", sa.String(length=50), nullable=True),
+        sa.Column("pending", sa.Boolean(), nullable=True),
+        sa.Column("image", sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    _create_table(
+        "plaid_institutions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("institution_id", sa.String(length=100), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Indexes declared with `index=True` / `unique=True` on the columns
+    _create_index("ix_users_id", "users", ["id"])
+    _create_index("ix_users_email", "users", ["email"], unique=True)
+    _create_index("ix_banks_id", "banks", ["id"])
+    _create_index("ix_transactions_id", "transactions", ["id"])
+    _create_index("ix_plaid_items_id", "plaid_items", ["id"])
+    _create_index("ix_plaid_items_item_id", "plaid_items", ["item_id"], unique=True)
+    _create_index("ix_plaid_accounts_id", "plaid_accounts", ["id"])
+    _create_index(
+        "ix_plaid_accounts_account_id", "plaid_accounts", ["account_id"], unique=True
+    )
+    _create_index("ix_plaid_accounts_item_id", "plaid_accounts", ["item_id"])
+    _create_index("ix_plaid_transactions_id", "plaid_transactions", ["id"])
+    _create_index(
+        "ix_plaid_transactions_transaction_id",
+        "plaid_transactions",
+        ["transaction_id"],
+        unique=True,
+    )
+    _create_index("ix_plaid_transactions_item_id", "plaid_transactions", ["item_id"])
+    _create_index(
+        "ix_plaid_transactions_account_id", "plaid_transactions", ["account_id"]
+    )
+    _create_index("ix_plaid_institutions_id", "plaid_institutions", ["id"])
+    _create_index(
+        "ix_plaid_institutions_institution_id",
+        "plaid_institutions",
+        ["institution_id"],
+        unique=True,
+    )
+
+    # Query indexes (`__table_args__`)
+    _create_index("ix_banks_user_id", "banks", ["user_id"])
+    _create_index("ix_banks_bank_id", "banks", ["bank_id"])
+    _create_index("ix_banks_shareable_id", "banks", ["shareable_id"], unique=True)
+    for column in ("sender_id", "receiver_id", "sender_bank_id", "receiver_bank_id"):
+        _create_index(
+            f"ix_transactions_{column}_date",
+            "transactions",
+            [column, sa.literal_column("date DESC")],
+        )
+    _create_index(
+        "ix_plaid_transactions_item_account_date",
+        "plaid_transactions",
+        [
+            "item_id",
+            "account_id",
+            sa.literal_column("date DESC"),
+            sa.literal_column("id DESC"),
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        "plaid_institutions",
+        "plaid_transactions",
+        "plaid_accounts",
+        "plaid_items",
+        "transactions",
+        "banks",
+        "users",
+    ):
+        op.drop_table(table)
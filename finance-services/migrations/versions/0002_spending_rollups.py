@@ -0,0 +1,87 @@
+"""Spending rollups
+
+Adds the per-user (month, category, account) spending totals behind the
+/transaction/summary endpoints and backfills them from the existing mirrored
+Plaid transactions and internal transfers.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO spending_rollups (user_id, month, category, account_id, total, count)
+SELECT user_id, month, category, account_id, SUM(total), SUM(count)
+FROM (
+    SELECT i.user_id,
+           date_trunc('month', p.date)::date AS month,
+           COALESCE(p.category, '') AS category,
+           p.account_id,
+           p.amount AS total,
+           1 AS count
+    FROM plaid_transactions p
+    JOIN plaid_items i ON i.item_id = p.item_id
+    WHERE p.date IS NOT NULL AND i.user_id IS NOT NULL
+
+    UNION ALL
+
+    SELECT t.sender_id, date_trunc('month', t.date)::date,
+           COALESCE(t.category, ''), b.account_id, t.amount, 1
+    FROM transactions t
+    JOIN banks b ON b.id = t.sender_bank_id
+    WHERE t.date IS NOT NULL AND t.sender_id IS NOT NULL
+
+    UNION ALL
+
+    SELECT t.receiver_id, date_trunc('month', t.date)::date,
+           COALESCE(t.category, ''), b.account_id, -t.amount, 1
+    FROM transactions t
+    JOIN banks b ON b.id = t.receiver_bank_id
+    WHERE t.date IS NOT NULL AND t.receiver_id IS NOT NULL
+) AS spending
+WHERE account_id IS NOT NULL
+GROUP BY user_id, month, category, account_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "spending_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("account_id", sa.String(length=100), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "month",
+            "category",
+            "account_id",
+            name="uq_spending_rollups_user_month_category_account",
+        ),
+    )
+    op.create_index("ix_spending_rollups_id", "spending_rollups", ["id"])
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("spending_rollups")
@@ -0,0 +1,141 @@
+"""Partition transactions by month
+
+Rebuilds `transactions` as a table range partitioned by month on `date`, so
+date-bounded reads only scan the partitions they need and old months can be
+detached instead of deleted row by row. The primary key becomes (id, date),
+as Postgres requires the partition key in it, and `date` becomes NOT NULL
+(rows without a date are stamped with the migration time).
+
+Partitions are created for every month from the oldest transfer through
+three months ahead, or through the newest transfer if that is later. Later
+months are created by the partition maintenance job
+(app/services/partition_service.py).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+COLUMNS = (
+    "id, name, sender_id, receiver_id, sender_bank_id, receiver_bank_id, "
+    "amount, date, type, category, channel, pending"
+)
+SIDES = ("sender_id", "receiver_id", "sender_bank_id", "receiver_bank_id")
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _columns(partitioned: bool) -> list:
+    return [
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('transactions_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=50), nullable=True),
+        sa.Column("sender_id", sa.Integer(), nullable=True),
+        sa.Column("receiver_id", sa.Integer(), nullable=True),
+        sa.Column("sender_bank_id", sa.Integer(), nullable=True),
+        sa.Column("receiver_bank_id", sa.Integer(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=not partitioned),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("channel", sa.String(length=50), nullable=True),
+        sa.Column("pending", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["receiver_bank_id"], ["banks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["receiver_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sender_bank_id"], ["banks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sender_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(*(("id", "date") if partitioned else ("id",))),
+    ]
+
+
+def _set_aside(old: str):
+    """Rename the current table and free its index and constraint names."""
+    op.execute(f"ALTER TABLE transactions RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT transactions_pkey TO {old}_pkey")
+    op.drop_index("ix_transactions_id", table_name=old)
+    for side in SIDES:
+        op.drop_index(f"ix_transactions_{side}_date", table_name=old)
+
+
+def _create_indexes():
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+    for side in SIDES:
+        op.create_index(
+            f"ix_transactions_{side}_date",
+            "transactions",
+            [side, sa.literal_column("date DESC")],
+        )
+
+
+def _move_rows(old: str):
+    """Copy the rows over, hand the id sequence to the new table, drop the old."""
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM {old}")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.drop_table(old)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "UPDATE transactions SET date = now() AT TIME ZONE 'utc' WHERE date IS NULL"
+    )
+    _set_aside("transactions_unpartitioned")
+
+    op.create_table(
+        "transactions", *_columns(True), postgresql_partition_by="RANGE (date)"
+    )
+
+    oldest, newest = (
+        op.get_bind()
+        .execute(
+            sa.text("SELECT min(date), max(date) FROM transactions_unpartitioned")
+        )
+        .one()
+    )
+    current = date.today().replace(day=1)
+    month = min(oldest.date(), current).replace(day=1) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    if newest:
+        last = max(last, newest.date().replace(day=1))
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    _create_indexes()
+    _move_rows("transactions_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived (detached) partitions are left in place and not copied back
+    _set_aside("transactions_partitioned")
+    op.create_table("transactions", *_columns(False))
+    _create_indexes()
+    _move_rows("transactions_partitioned")
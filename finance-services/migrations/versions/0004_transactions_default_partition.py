@@ -0,0 +1,62 @@
+"""Add a DEFAULT partition to transactions
+
+Without it, inserting a transfer dated in a month that has no partition
+(before the first one, in an archived month, or past the look-ahead window)
+fails with "no partition of relation found for row". Such rows now land in
+`transactions_default`; the partition maintenance job moves them into their
+month's partition when it creates it.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Give every month still in the DEFAULT partition a partition of its own,
+    # so no rows are dropped with it
+    months = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT DISTINCT date_trunc('month', date)::date "
+                "FROM transactions_default"
+            )
+        )
+        .scalars()
+        .all()
+    )
+    op.execute("ALTER TABLE transactions DETACH PARTITION transactions_default")
+    for month in months:
+        op.execute(
+            f"CREATE TABLE transactions_{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{_add_months(month, 1).isoformat()}')"
+        )
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_default")
+    op.drop_table("transactions_default")
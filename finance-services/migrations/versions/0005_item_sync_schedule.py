@@ -0,0 +1,75 @@
+"""Keep the background sync schedule on plaid_items
+
+Every worker process runs a sync scheduler. Moving the schedule into the
+database lets them share it: workers claim due items with FOR UPDATE SKIP
+LOCKED and lease them while they sync, instead of each polling every item.
+
+Adds `next_sync_at`, `sync_lease_until` and `sync_failures`, creates the
+missing `plaid_items` rows of linked banks so the scheduler sees every item,
+and spreads the first syncs of existing items over five minutes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "plaid_items",
+        sa.Column(
+            "next_sync_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "plaid_items", sa.Column("sync_lease_until", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "plaid_items",
+        sa.Column("sync_failures", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        op.f("ix_plaid_items_next_sync_at"), "plaid_items", ["next_sync_at"]
+    )
+    op.create_index(
+        op.f("ix_plaid_items_sync_lease_until"), "plaid_items", ["sync_lease_until"]
+    )
+
+    op.execute(
+        """
+        INSERT INTO plaid_items (item_id, user_id)
+        SELECT DISTINCT ON (bank_id) bank_id, user_id
+        FROM banks
+        ORDER BY bank_id, id
+        ON CONFLICT (item_id) DO NOTHING
+        """
+    )
+    op.execute(
+        "UPDATE plaid_items "
+        "SET next_sync_at = now() + random() * interval '5 minutes'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_plaid_items_sync_lease_until"), table_name="plaid_items")
+    op.drop_index(op.f("ix_plaid_items_next_sync_at"), table_name="plaid_items")
+    op.drop_column("plaid_items", "sync_failures")
+    op.drop_column("plaid_items", "sync_lease_until")
+    op.drop_column("plaid_items", "next_sync_at")
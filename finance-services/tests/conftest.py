@@ -0,0 +1,72 @@
+"""
+Shared test setup.
+
+Settings are read from the environment when `app` is first imported, so
+placeholder values for the required ones are set here, before any test module
+imports the app. Real values from the environment or `.env` take precedence.
+Nothing in the suite talks to Plaid or Dwolla, and only tests marked `db`
+need a database.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+TEST_SETTINGS = {
+    "Frontend_Url": "http://localhost:3000",
+    "ACCESS_TOKEN_SECRET": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "finance_test",
+    "PLAID_CLIENT_ID": "test-client",
+    "PLAID_SECRET": "test-secret",
+    "PLAID_PRODUCT": '["transactions"]',
+    "PLAID_COUNTRY_CODE": '["US"]',
+    "DWOLLA_KEY": "test-key",
+    "DWOLLA_SECRET": "test-secret",
+    "DWOLLA_BASE_URL": "https://api-sandbox.dwolla.com",
+    "SYNC_ENABLED": "false",
+    "DB_MIGRATE_ON_STARTUP": "false",
+}
+for name, value in TEST_SETTINGS.items():
+    os.environ.setdefault(name, value)
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("TEST_DATABASE_URL"):
+        return
+    skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+    for item in items:
+        if "db" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def migrated_database():
+    """
+    URL of the TEST_DATABASE_URL database, migrated to head for the session and
+    back to base afterwards. Only for tests marked `db`.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine
+
+    url = os.environ["TEST_DATABASE_URL"]
+    engine = create_engine(url)
+    config = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+    yield url
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "base")
+    engine.dispose()
@@ -0,0 +1,199 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.bank import Bank
+from app.models.transactions import Transaction
+from app.models.user import User
+from app.services import bank_service
+from app.services.bank_service import store_balances
+from app.services.rollup_service import record_transfer
+from app.services.transaction_service import (
+    apply_transactions_delta,
+    get_or_create_item,
+)
+from app.utils.database import naive_utc, utcnow
+from app.utils.plaid_client import encrypt_id
+from app.utils.plaid_projection import TransactionRecord
+from app.utils.resilience import UpstreamUnavailable
+
+# The account fields of a balance cache entry
+ACCOUNT_FIELDS = (
+    "account_id",
+    "available_balance",
+    "current_balance",
+    "institution_id",
+    "name",
+    "official_name",
+    "mask",
+    "type",
+    "subtype",
+)
+
+
+class PlaidModel(dict):
+    """
+    Stands in for a Plaid API model: attribute access and `get`.
+    """
+
+    __getattr__ = dict.__getitem__
+
+
+def test_naive_utc():
+    eastern = timezone(timedelta(hours=-5))
+
+    assert naive_utc(datetime(2024, 3, 15, 7, tzinfo=eastern)) == datetime(
+        2024, 3, 15, 12
+    )
+    assert naive_utc(datetime(2024, 3, 15, 12)) == datetime(2024, 3, 15, 12)
+    assert utcnow().tzinfo is None
+    assert Transaction.__table__.c.date.default.arg(None).tzinfo is None
+
+
+async def _seed(db, name: str):
+    """
+    Two users with a bank each; `name` keeps the rows of each test apart.
+    """
+    users = [
+        User(
+            first_name=name,
+            last_name=str(n),
+            email=f"{name}-{n}@async.test",
+            hashed_password="x",
+        )
+        for n in range(2)
+    ]
+    db.add_all(users)
+    await db.commit()
+    banks = [
+        Bank(
+            user_id=user.id,
+            bank_id=f"item-{user.id}",
+            account_id=f"account-{user.id}",
+            access_token=encrypt_id(f"access-{user.id}"),
+            shareable_id=f"shareable-{user.id}",
+        )
+        for user in users
+    ]
+    db.add_all(banks)
+    await db.commit()
+    return users, banks
+
+
+def run_on_asyncpg(database_url: str, test):
+    """
+    Run `test(db)` on an AsyncSession over asyncpg, the DB_ASYNC driver.
+    """
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+
+    async def main():
+        engine = create_async_engine(url)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+@pytest.mark.db
+def test_sync_and_transfer_writes_on_asyncpg(migrated_database):
+    """
+    asyncpg, unlike psycopg2, rejects aware datetimes for the schema's
+    timestamp columns; every write path must hand it naive UTC.
+    """
+
+    async def test(db):
+        (sender, receiver), banks = await _seed(db, "writes")
+
+        item = await get_or_create_item(banks[0].bank_id, sender.id, db)
+        record = TransactionRecord(
+            "t1",
+            banks[0].account_id,
+            "Coffee",
+            4.5,
+            date(2024, 3, 15),
+            "FOOD",
+            "in store",
+            False,
+            None,
+        )
+        assert await apply_transactions_delta(
+            item, item.cursor, {"t1": record}, set(), "cursor-1", db
+        )
+
+        account = PlaidModel(
+            account_id=banks[0].account_id,
+            name="Checking",
+            balances=PlaidModel(available=10.0, current=12.0),
+        )
+        institution = {"institution_id": "ins_1"}
+        await store_balances(item, (PlaidModel(accounts=[account]), institution), db)
+
+        transfer = Transaction(
+            name="Rent",
+            sender_id=sender.id,
+            receiver_id=receiver.id,
+            sender_bank_id=banks[0].id,
+            receiver_bank_id=banks[1].id,
+            amount=100.0,
+            type="transfer",
+        )
+        db.add(transfer)
+        await record_transfer(transfer, db)
+        await db.commit()
+
+        await db.refresh(item)
+        assert item.transactions_synced_at is not None
+        assert item.balances_synced_at is not None
+
+    run_on_asyncpg(migrated_database, test)
+
+
+@pytest.mark.db
+def test_account_falls_back_to_mirror_on_asyncpg(migrated_database, monkeypatch):
+    """
+    A failed sync rolls the session back and expires the bank and item; the
+    fallback must not lazy load them, which an AsyncSession cannot do.
+    """
+
+    async def failing_sync(access_token, item_id, user_id, db):
+        await db.rollback()
+        raise UpstreamUnavailable("plaid circuit is open")
+
+    monkeypatch.setattr(bank_service, "sync_transactions", failing_sync)
+
+    async def test(db):
+        _, (bank, _) = await _seed(db, "fallback")
+        item = await get_or_create_item(bank.bank_id, bank.user_id, db)
+        item.transactions_synced_at = utcnow() - timedelta(days=1)
+        await db.commit()
+        bank_service.balance_cache.set(
+            bank.bank_id,
+            {
+                "accounts": [
+                    {
+                        **dict.fromkeys(ACCOUNT_FIELDS),
+                        "account_id": bank.account_id,
+                        "name": "Checking",
+                    }
+                ],
+                "as_of": datetime.now(timezone.utc),
+            },
+        )
+
+        try:
+            loaded, _, _, account = await bank_service._load_account(
+                bank.shareable_id, db
+            )
+        finally:
+            bank_service.balance_cache.clear()
+
+        assert loaded.account_id == bank.account_id
+        assert account["id"] == bank.account_id
+
+    run_on_asyncpg(migrated_database, test)
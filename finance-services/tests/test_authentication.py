@@ -0,0 +1,91 @@
+import asyncio
+import types
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.user import User
+from app.services import auth_service
+from app.services.auth_service import authenticate_user, principal_cache
+from app.utils.jwt_handler import create_access_token
+
+USER = User(
+    id=7,
+    first_name="Ada",
+    last_name="Lovelace",
+    email="ada@example.com",
+    is_active=True,
+)
+
+
+class Sessions:
+    """
+    Stands in for `read_session_scope`, tracking the sessions it hands out.
+    """
+
+    def __init__(self):
+        self.opened = 0
+        self.open = 0
+
+    @asynccontextmanager
+    async def scope(self, request):
+        self.opened += 1
+        self.open += 1
+        try:
+            yield self
+        finally:
+            self.open -= 1
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    sessions = Sessions()
+
+    async def db_scalar(db, statement):
+        # The user is only read while its session is open
+        assert db.open == 1
+        return USER if USER.id in statement.compile().params.values() else None
+
+    monkeypatch.setattr(auth_service, "read_session_scope", sessions.scope)
+    monkeypatch.setattr(auth_service, "db_scalar", db_scalar)
+    principal_cache.clear()
+    yield sessions
+    principal_cache.clear()
+
+
+def request_as(user_id: int):
+    token = create_access_token({"user_id": str(user_id)})
+    return types.SimpleNamespace(cookies={"jwt": token})
+
+
+def test_user_is_read_on_a_session_closed_before_the_route(sessions):
+    principal = asyncio.run(authenticate_user(request_as(USER.id)))
+
+    assert principal.email == USER.email
+    assert (sessions.opened, sessions.open) == (1, 0)
+
+
+def test_cached_principal_opens_no_session(sessions):
+    request = request_as(USER.id)
+    first = asyncio.run(authenticate_user(request))
+    second = asyncio.run(authenticate_user(request))
+
+    assert second is first
+    assert sessions.opened == 1
+
+
+def test_unknown_user_is_rejected(sessions):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(authenticate_user(request_as(8)))
+
+    assert error.value.status_code == 404
+    assert sessions.open == 0
+
+
+def test_missing_token_is_rejected_without_a_session(sessions):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(authenticate_user(types.SimpleNamespace(cookies={})))
+
+    assert error.value.status_code == 401
+    assert sessions.opened == 0
@@ -0,0 +1,86 @@
+import pytest
+
+from app.utils import cache
+from app.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    ttls = TTLCache(maxsize=8, ttl=60)
+    ttls.set("key", "value")
+
+    clock.now += 59
+    assert ttls.get("key") == "value"
+    clock.now += 1
+    assert ttls.get("key", "missing") == "missing"
+    assert len(ttls) == 0
+
+
+def test_ttl_can_be_set_per_entry(clock):
+    ttls = TTLCache(maxsize=8, ttl=60)
+    ttls.set("short", 1, ttl=5)
+    ttls.set("long", 2)
+
+    clock.now += 10
+    assert ttls.get("short") is None
+    assert ttls.get("long") == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    ttls = TTLCache(maxsize=2, ttl=60)
+    ttls.set("a", 1)
+    ttls.set("b", 2)
+    ttls.get("a")
+    ttls.set("c", 3)
+
+    assert ttls.keys() == ["a", "c"]
+    assert ttls.get("b") is None
+
+
+def test_keys_include_expired_entries_until_read(clock):
+    ttls = TTLCache(maxsize=8, ttl=60)
+    ttls.set("a", 1)
+    ttls.set("b", 2, ttl=120)
+
+    clock.now += 90
+    assert ttls.keys() == ["a", "b"]
+    ttls.get("a")
+    assert ttls.keys() == ["b"]
+
+
+def test_hits_and_misses_are_counted(clock):
+    ttls = TTLCache(maxsize=8, ttl=60)
+    ttls.set("key", "value")
+
+    ttls.get("key")
+    ttls.get("other")
+    clock.now += 60
+    ttls.get("key")
+
+    assert (ttls.hits, ttls.misses) == (1, 2)
+
+
+def test_invalidate_and_clear(clock):
+    ttls = TTLCache(maxsize=8, ttl=60)
+    ttls.set("a", 1)
+    ttls.set("b", 2)
+
+    ttls.invalidate("a")
+    ttls.invalidate("missing")
+    assert ttls.keys() == ["b"]
+    ttls.clear()
+    assert len(ttls) == 0
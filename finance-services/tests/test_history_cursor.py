@@ -0,0 +1,77 @@
+import base64
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import column
+
+from app.services.transaction_service import (
+    PLAID_RANK,
+    TRANSFER_RANK,
+    _past_cursor,
+    decode_history_cursor,
+    encode_history_cursor,
+)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        (datetime(2024, 3, 15, 12, 30, 45, 123456), TRANSFER_RANK, 42),
+        (datetime(2024, 3, 15), PLAID_RANK, 1),
+        (datetime(1999, 12, 31, 23, 59, 59), TRANSFER_RANK, 2**40),
+    ],
+)
+def test_cursor_round_trips(key):
+    cursor = encode_history_cursor(key)
+
+    assert decode_history_cursor(cursor) == key
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_history_cursor((datetime(2024, 3, 15), TRANSFER_RANK, 2**60))
+
+    assert not set(cursor) - set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        "é",
+        _b64(b"not json"),
+        _b64(b"{}"),
+        _b64(b'["2024-03-15T00:00:00", 1]'),
+        _b64(b'["yesterday", 1, 42]'),
+        _b64(b'[20240315, 1, 42]'),
+        _b64(b'["2024-03-15T00:00:00", "first", 42]'),
+        _b64(b'["2024-03-15T00:00:00", 1, null]'),
+    ],
+)
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_history_cursor(cursor)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "rank, expected",
+    [
+        (PLAID_RANK, "date <= :date_1"),
+        (TRANSFER_RANK, "(date, id) < (:param_1, :param_2)"),
+    ],
+)
+def test_past_cursor_orders_sources_at_equal_timestamps(rank, expected):
+    # A transfer cursor: Plaid rows of the same timestamp still follow it
+    key = (datetime(2024, 3, 15), TRANSFER_RANK, 42)
+
+    condition = _past_cursor(column("date"), column("id"), rank, key[0], key)
+
+    assert str(condition) == expected
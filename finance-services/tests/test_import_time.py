@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks.import_time import LAZY_MODULES, app_imports, measure
+
+# Override on slow CI machines
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1200"))
+RUNS = 2
+
+
+@pytest.fixture(scope="module")
+def imports():
+    """
+    The imports of `import app.main` in a fresh interpreter, from the fastest
+    of a few runs.
+    """
+    cwd = os.getcwd()
+    os.chdir(Path(__file__).resolve().parents[1])
+    try:
+        runs = [app_imports(measure()) for _ in range(RUNS)]
+    finally:
+        os.chdir(cwd)
+    return min(runs, key=lambda imports: imports[-1][1])
+
+
+def test_app_imports_within_budget(imports):
+    total_ms = imports[-1][1] / 1000
+
+    assert total_ms <= BUDGET_MS
+
+
+def test_sdks_are_not_imported_at_boot(imports):
+    eager = {
+        module
+        for _, _, _, module in imports
+        if module.split(".")[0] in LAZY_MODULES
+    }
+
+    assert not eager
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import metrics
+from app.core.config import settings
+
+TOKEN = "metrics-token"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+def test_metrics_are_hidden_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer "})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", TOKEN])
+def test_metrics_require_the_bearer_token(client, monkeypatch, authorization):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", TOKEN)
+    headers = {"Authorization": authorization} if authorization else {}
+
+    response = client.get("/metrics", headers=headers)
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_metrics_are_served_with_the_bearer_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", TOKEN)
+
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
@@ -0,0 +1,100 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import partition_service
+from app.services.partition_service import (
+    MAINTENANCE_LOCK_KEY,
+    add_months,
+    maintain_partitions,
+    partition_name,
+)
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partition_name(date(2024, 3, 1)) == "transactions_2024_03"
+
+
+class Maintenance:
+    """
+    Records the partition work `maintain_partitions` does, in place of the
+    DDL.
+    """
+
+    def __init__(self):
+        self.runs = 0
+
+    async def ensure_partitions(self, db, months_ahead, retention_months=0):
+        self.runs += 1
+        return []
+
+    async def archive_partitions(self, db, retention_months):
+        return []
+
+
+@pytest.fixture
+def maintenance(monkeypatch):
+    maintenance = Maintenance()
+    monkeypatch.setattr(
+        partition_service, "ensure_partitions", maintenance.ensure_partitions
+    )
+    monkeypatch.setattr(
+        partition_service, "archive_partitions", maintenance.archive_partitions
+    )
+    return maintenance
+
+
+@pytest.mark.parametrize("locked, runs", [(True, 1), (False, 0)])
+def test_maintenance_runs_only_under_the_lock(monkeypatch, maintenance, locked, runs):
+    statements = []
+
+    @asynccontextmanager
+    async def session_scope():
+        yield "db"
+
+    async def db_scalar(db, statement):
+        statements.append(statement)
+        return locked
+
+    async def db_commit(db):
+        pass
+
+    monkeypatch.setattr(partition_service, "session_scope", session_scope)
+    monkeypatch.setattr(partition_service, "db_scalar", db_scalar)
+    monkeypatch.setattr(partition_service, "db_commit", db_commit)
+
+    asyncio.run(maintain_partitions())
+
+    assert maintenance.runs == runs
+    assert "pg_try_advisory_xact_lock" in str(statements[0])
+
+
+@pytest.mark.db
+def test_concurrent_maintenance_is_skipped(migrated_database, monkeypatch, maintenance):
+    engine = create_engine(migrated_database)
+
+    @asynccontextmanager
+    async def session_scope():
+        with Session(engine) as db:
+            yield db
+
+    monkeypatch.setattr(partition_service, "session_scope", session_scope)
+
+    with engine.connect() as holder:
+        with holder.begin():
+            holder.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": MAINTENANCE_LOCK_KEY},
+            )
+            asyncio.run(maintain_partitions())
+            assert maintenance.runs == 0
+
+    asyncio.run(maintain_partitions())
+    assert maintenance.runs == 1
+    engine.dispose()
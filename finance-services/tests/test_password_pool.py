@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+from argon2 import PasswordHasher
+
+from app.utils.password_handler import PasswordHasherBusy, PasswordHashPool
+
+PASSWORD = "SecurePass123"
+
+
+class BlockingHasher:
+    """
+    Verifies every password until released, holding its worker thread.
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def verify(self, hashed_password: str, password: str) -> bool:
+        self.release.wait(timeout=5)
+        return True
+
+
+@pytest.fixture
+def hasher():
+    # The lowest Argon2 cost, to keep the tests fast
+    return PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
+
+
+def test_hash_and_verify(hasher):
+    pool = PasswordHashPool(hasher, max_workers=2, max_queue=2)
+
+    async def main():
+        hashed = await pool.hash(PASSWORD)
+        return (
+            await pool.verify(hashed, PASSWORD),
+            await pool.verify(hashed, "WrongPass123"),
+        )
+
+    assert asyncio.run(main()) == (True, False)
+    pool.shutdown()
+
+
+def test_invalid_stored_hash_does_not_verify(hasher):
+    pool = PasswordHashPool(hasher, max_workers=1, max_queue=0)
+
+    assert asyncio.run(pool.verify("not an argon2 hash", PASSWORD)) is False
+    pool.shutdown()
+
+
+def test_saturated_pool_sheds_load():
+    hasher = BlockingHasher()
+    pool = PasswordHashPool(hasher, max_workers=1, max_queue=1)
+
+    async def main():
+        accepted = [
+            asyncio.create_task(pool.verify("hash", PASSWORD)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await pool.verify("hash", PASSWORD)
+
+        hasher.release.set()
+        return await asyncio.gather(*accepted)
+
+    assert asyncio.run(main()) == [True, True]
+    assert pool.stats() == {
+        "pending": 0,
+        "completed": 2,
+        "rejected": 1,
+        "max_workers": 1,
+        "max_queue": 1,
+    }
+    pool.shutdown()
+
+
+def test_cancelled_caller_holds_its_slot_until_the_work_ends():
+    hasher = BlockingHasher()
+    pool = PasswordHashPool(hasher, max_workers=1, max_queue=0)
+
+    async def main():
+        caller = asyncio.create_task(pool.verify("hash", PASSWORD))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        with pytest.raises(PasswordHasherBusy):
+            await pool.verify("hash", PASSWORD)
+
+        hasher.release.set()
+        while pool.stats()["pending"]:
+            await asyncio.sleep(0.01)
+        return await pool.verify("hash", PASSWORD)
+
+    assert asyncio.run(main()) is True
+    pool.shutdown()
@@ -0,0 +1,125 @@
+import asyncio
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.bank import Bank
+from app.models.plaid import PlaidTransaction
+from app.models.transactions import Transaction
+from app.services.ledger_service import ledger_query
+from app.services.partition_service import ensure_partitions
+from app.services.transaction_service import _history_transfers
+from benchmarks.query_plans import explain, pruned_queries, queries
+
+
+def _index_columns(table) -> set:
+    """
+    Column names of every index on `table`, in index order, with the
+    direction of `desc()` expressions dropped.
+    """
+    indexes = {(column.name,) for column in table.columns if column.index}
+    for index in table.indexes:
+        indexes.add(
+            tuple(
+                getattr(expression, "element", expression).name
+                for expression in index.expressions
+            )
+        )
+    return indexes
+
+
+def _has_index(table, *columns) -> bool:
+    return any(
+        index[: len(columns)] == columns for index in _index_columns(table)
+    )
+
+
+def _sql(statement) -> str:
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+# ================================================
+# Without a database: indexes and query shape
+# ================================================
+
+
+@pytest.mark.parametrize("column", ["user_id", "bank_id", "shareable_id"])
+def test_bank_lookups_are_indexed(column):
+    assert _has_index(Bank.__table__, column)
+
+
+@pytest.mark.parametrize(
+    "column", ["sender_id", "receiver_id", "sender_bank_id", "receiver_bank_id"]
+)
+def test_ledger_sides_are_indexed_by_party_and_date(column):
+    assert _has_index(Transaction.__table__, column, "date")
+
+
+def test_account_history_is_indexed_in_stream_order():
+    assert _has_index(PlaidTransaction.__table__, "item_id", "account_id", "date")
+
+
+@pytest.mark.parametrize("bank_id", [None, 1])
+def test_ledger_query_is_a_union_of_single_party_sides(bank_id):
+    sql = _sql(ledger_query(1, bank_id))
+
+    assert "UNION ALL" in sql
+    assert " OR " not in sql
+    assert "transactions.sender_id = 1" in sql
+    assert "transactions.receiver_id = 1" in sql
+    if bank_id is not None:
+        assert "transactions.sender_bank_id = 1" in sql
+        assert "transactions.receiver_bank_id = 1" in sql
+
+
+def test_history_transfers_bound_the_partition_key():
+    sql = _sql(
+        _history_transfers(1, None, None, date(2024, 3, 1), date(2024, 3, 31), 50)
+    )
+
+    assert "ledger.date >= '2024-03-01 00:00:00'" in sql
+    assert "ledger.date < '2024-04-01 00:00:00'" in sql
+
+
+# ================================================
+# Against Postgres: EXPLAIN
+# ================================================
+
+
+@pytest.fixture(scope="module")
+def engine(migrated_database):
+    engine = create_engine(migrated_database)
+    with Session(engine) as db:
+        asyncio.run(ensure_partitions(db, 1, today=date(2024, 3, 1)))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("name", list(queries()))
+def test_hot_queries_use_indexes(engine, name):
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        plan = explain(connection, engine, queries()[name])
+
+    assert "Seq Scan" not in plan, plan
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("name", list(pruned_queries()))
+def test_history_reads_are_pruned_to_their_months(engine, name):
+    statement, allowed = pruned_queries()[name]
+    with engine.connect() as connection:
+        plan = explain(connection, engine, statement)
+
+    scanned = set(re.findall(r"\btransactions_\d{4}_\d{2}\b", plan))
+    assert scanned and scanned <= allowed, plan
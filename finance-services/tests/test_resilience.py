@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+
+from app.utils import resilience
+from app.utils.resilience import (
+    CircuitBreaker,
+    OutboundPolicy,
+    TokenBucket,
+    UpstreamUnavailable,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class Transient(Exception):
+    pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+# ================================================
+# TokenBucket
+# ================================================
+
+
+def test_bucket_lets_a_burst_through(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_refills_at_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    for _ in range(3):
+        bucket.reserve()
+
+    clock.now += 1
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() > 0
+
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+# ================================================
+# CircuitBreaker
+# ================================================
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("plaid", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("plaid", failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_lets_one_probe_through_after_reset_timeout(clock):
+    breaker = CircuitBreaker("plaid", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.now += 30
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Other calls wait for the probe's outcome
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = CircuitBreaker("plaid", failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 29
+    with pytest.raises(UpstreamUnavailable):
+        breaker.before_call()
+
+
+# ================================================
+# OutboundPolicy
+# ================================================
+
+
+@pytest.fixture
+def policy(clock, monkeypatch):
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr(resilience.asyncio, "sleep", no_sleep)
+    return OutboundPolicy(
+        "plaid",
+        rate=100,
+        burst=100,
+        is_retryable=lambda error: isinstance(error, Transient),
+        max_attempts=3,
+        failure_threshold=5,
+    )
+
+
+def failing(error: Exception, times: int):
+    """
+    An upstream call that raises `error` `times` times, then succeeds.
+    """
+    attempts = []
+
+    async def fn():
+        attempts.append(1)
+        if len(attempts) <= times:
+            raise error
+        return "ok"
+
+    return fn, attempts
+
+
+def test_transient_failures_are_retried(policy):
+    fn, attempts = failing(Transient(), 2)
+
+    assert asyncio.run(policy.call(fn)) == "ok"
+    assert len(attempts) == 3
+    assert policy.retries == 2
+
+
+def test_non_idempotent_calls_are_attempted_once(policy):
+    fn, attempts = failing(Transient(), 1)
+
+    with pytest.raises(Transient):
+        asyncio.run(policy.call(fn, retry=False))
+    assert len(attempts) == 1
+    assert policy.breaker.failures == 1
+
+
+def test_request_errors_are_not_retried_or_counted(policy):
+    fn, attempts = failing(ValueError(), 1)
+
+    with pytest.raises(ValueError):
+        asyncio.run(policy.call(fn))
+    assert len(attempts) == 1
+    assert policy.breaker.failures == 0
+
+
+def test_open_breaker_rejects_without_calling_upstream(policy):
+    fn, attempts = failing(Transient(), 100)
+    for _ in range(2):
+        with pytest.raises(Transient):
+            asyncio.run(policy.call(fn))
+    assert policy.breaker.is_open
+    called = len(attempts)
+
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(policy.call(fn))
+    assert len(attempts) == called
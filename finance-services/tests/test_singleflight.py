@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+class SlowCall:
+    """
+    A call that blocks until released, counting how often it was started.
+    """
+
+    def __init__(self, result="response"):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_calls_with_one_key_share_one_execution():
+    async def main():
+        flight, fetch = SingleFlight(), SlowCall()
+        callers = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        return flight, fetch, await asyncio.gather(*callers)
+
+    flight, fetch, results = asyncio.run(main())
+
+    assert results == ["response"] * 5
+    assert fetch.calls == 1
+    assert flight.stats() == {"issued": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_distinct_keys_run_separately():
+    async def main():
+        flight, fetch = SingleFlight(), SlowCall()
+        callers = [asyncio.create_task(flight.do(key, fetch)) for key in "ab"]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        await asyncio.gather(*callers)
+        return fetch
+
+    assert asyncio.run(main()).calls == 2
+
+
+def test_finished_call_is_not_reused():
+    async def main():
+        flight, fetch = SingleFlight(), SlowCall()
+        fetch.release.set()
+        await flight.do("key", fetch)
+        await flight.do("key", fetch)
+        return fetch
+
+    assert asyncio.run(main()).calls == 2
+
+
+def test_error_is_raised_to_every_caller():
+    async def main():
+        flight, fetch = SingleFlight(), SlowCall(ValueError("upstream"))
+        callers = [asyncio.create_task(flight.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    async def main():
+        flight, fetch = SingleFlight(), SlowCall()
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        fetch.release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return fetch, await second
+
+    fetch, result = asyncio.run(main())
+
+    assert result == "response"
+    assert fetch.calls == 1
@@ -0,0 +1,255 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.bank import Bank
+from app.models.plaid import PlaidItem
+from app.models.user import User
+from app.services import sync_scheduler as sync_scheduler_module
+from app.services import webhook_service
+from app.services.sync_scheduler import sync_scheduler
+from app.services.webhook_service import handle_plaid_webhook, verify_plaid_webhook
+
+KEY_ID = "test-key"
+BODY = json.dumps(
+    {
+        "webhook_type": "TRANSACTIONS",
+        "webhook_code": "SYNC_UPDATES_AVAILABLE",
+        "item_id": "item-1",
+    }
+).encode()
+
+
+def _b64url(number: int) -> str:
+    return base64.urlsafe_b64encode(number.to_bytes(32, "big")).rstrip(b"=").decode()
+
+
+class FakePlaidSender:
+    """
+    Signs webhook bodies the way Plaid does: an ES256 JWT carrying the body's
+    SHA-256, whose public key Plaid serves as a JWK by key ID.
+    """
+
+    def __init__(self):
+        self.private_key = ec.generate_private_key(ec.SECP256R1())
+
+    @property
+    def jwk(self) -> dict:
+        numbers = self.private_key.public_key().public_numbers()
+        return {
+            "alg": "ES256",
+            "crv": "P-256",
+            "kid": KEY_ID,
+            "kty": "EC",
+            "use": "sig",
+            "x": _b64url(numbers.x),
+            "y": _b64url(numbers.y),
+            "created_at": int(time.time()),
+            "expired_at": None,
+        }
+
+    def sign(self, body: bytes, iat=None, key_id: str = KEY_ID) -> str:
+        pem = self.private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        claims = {
+            "iat": int(time.time()) if iat is None else iat,
+            "request_body_sha256": hashlib.sha256(body).hexdigest(),
+        }
+        return jwt.encode(claims, pem, algorithm="ES256", headers={"kid": key_id})
+
+
+@pytest.fixture
+def sender():
+    sender = FakePlaidSender()
+    # Serve the sender's key from the cache instead of Plaid's key endpoint
+    webhook_service._verification_keys.set(KEY_ID, sender.jwk)
+    yield sender
+    webhook_service._verification_keys.clear()
+
+
+def verify(body: bytes, signed_jwt: str):
+    asyncio.run(verify_plaid_webhook(body, signed_jwt))
+
+
+def assert_rejected(body: bytes, signed_jwt: str):
+    with pytest.raises(HTTPException) as error:
+        verify(body, signed_jwt)
+    assert error.value.status_code == 401
+
+
+def test_valid_webhook_is_accepted(sender):
+    verify(BODY, sender.sign(BODY))
+
+
+def test_missing_signature_is_rejected(sender):
+    assert_rejected(BODY, "")
+
+
+def test_signature_by_another_key_is_rejected(sender):
+    impostor = FakePlaidSender()
+    assert_rejected(BODY, impostor.sign(BODY))
+
+
+def test_stale_webhook_is_rejected(sender):
+    iat = int(time.time()) - webhook_service.MAX_WEBHOOK_AGE_SECONDS - 60
+    assert_rejected(BODY, sender.sign(BODY, iat=iat))
+
+
+def test_body_hash_mismatch_is_rejected(sender):
+    signed_jwt = sender.sign(BODY)
+    tampered = BODY.replace(b"item-1", b"item-2")
+    assert_rejected(tampered, signed_jwt)
+
+
+def test_expired_key_is_rejected(sender):
+    webhook_service._verification_keys.set(
+        KEY_ID, {**sender.jwk, "expired_at": int(time.time())}
+    )
+    assert_rejected(BODY, sender.sign(BODY))
+
+
+def test_unhandled_webhook_types_are_ignored():
+    body = json.dumps({"webhook_type": "ITEM", "webhook_code": "ERROR"}).encode()
+    assert asyncio.run(handle_plaid_webhook(body)) == {"status": "ignored"}
+
+
+# ================================================
+# Webhook to scheduled sync
+# ================================================
+
+
+def webhook(webhook_type: str, webhook_code: str, item_id: str = "item-1") -> bytes:
+    return json.dumps(
+        {
+            "webhook_type": webhook_type,
+            "webhook_code": webhook_code,
+            "item_id": item_id,
+        }
+    ).encode()
+
+
+@pytest.fixture
+def requested(monkeypatch):
+    """
+    Item IDs passed to `request_sync`, with every item linked to a bank.
+    """
+    requested = []
+
+    @asynccontextmanager
+    async def session_scope():
+        yield None
+
+    async def db_scalar(db, statement):
+        return 1
+
+    async def request_sync(item_id):
+        requested.append(item_id)
+
+    monkeypatch.setattr(webhook_service, "session_scope", session_scope)
+    monkeypatch.setattr(webhook_service, "db_scalar", db_scalar)
+    monkeypatch.setattr(sync_scheduler, "request_sync", request_sync)
+    return requested
+
+
+@pytest.mark.parametrize(
+    "webhook_type, webhook_code",
+    [
+        ("TRANSACTIONS", "SYNC_UPDATES_AVAILABLE"),
+        ("TRANSACTIONS", "DEFAULT_UPDATE"),
+        ("ITEM", "NEW_ACCOUNTS_AVAILABLE"),
+    ],
+)
+def test_update_webhooks_request_a_sync(requested, webhook_type, webhook_code):
+    response = asyncio.run(handle_plaid_webhook(webhook(webhook_type, webhook_code)))
+
+    assert response == {"status": "queued"}
+    assert requested == ["item-1"]
+
+
+def test_other_webhooks_request_nothing(requested):
+    response = asyncio.run(handle_plaid_webhook(webhook("ITEM", "ERROR")))
+
+    assert response == {"status": "ignored"}
+    assert requested == []
+
+
+@pytest.mark.db
+def test_repeated_webhooks_schedule_one_sync(migrated_database, monkeypatch):
+    engine = create_engine(migrated_database)
+
+    @asynccontextmanager
+    async def session_scope():
+        with Session(engine, expire_on_commit=False) as db:
+            yield db
+
+    for module in (webhook_service, sync_scheduler_module):
+        monkeypatch.setattr(module, "session_scope", session_scope)
+    monkeypatch.setattr(sync_scheduler, "debounce", 60)
+
+    with Session(engine) as db:
+        user = User(
+            first_name="Web",
+            last_name="Hook",
+            email="hook@example.com",
+            hashed_password="x",
+        )
+        db.add(user)
+        db.flush()
+        db.add(Bank(user_id=user.id, bank_id="item-hook", account_id="acc"))
+        # Synced just now: not due again for an hour
+        db.add(
+            PlaidItem(
+                item_id="item-hook",
+                user_id=user.id,
+                next_sync_at=func.now() + timedelta(hours=1),
+            )
+        )
+        db.commit()
+        user_id = user.id
+
+    def next_sync_at():
+        with Session(engine) as db:
+            return db.scalar(
+                select(PlaidItem.next_sync_at).where(PlaidItem.item_id == "item-hook")
+            )
+
+    body = webhook("TRANSACTIONS", "SYNC_UPDATES_AVAILABLE", "item-hook")
+    assert asyncio.run(handle_plaid_webhook(body)) == {"status": "queued"}
+    due = next_sync_at()
+    assert asyncio.run(handle_plaid_webhook(body)) == {"status": "queued"}
+
+    # The second webhook joins the sync the first one scheduled
+    assert next_sync_at() == due
+    assert asyncio.run(sync_scheduler._claim_due_items(10)) == []
+
+    with Session(engine) as db:
+        db.execute(
+            update(PlaidItem)
+            .where(PlaidItem.item_id == "item-hook")
+            .values(next_sync_at=func.now())
+        )
+        db.commit()
+    claimed = asyncio.run(sync_scheduler._claim_due_items(10))
+    assert [bank.bank_id for bank, _ in claimed] == ["item-hook"]
+    assert asyncio.run(sync_scheduler._claim_due_items(10)) == []
+
+    with Session(engine) as db:
+        db.execute(delete(User).where(User.id == user_id))
+        db.execute(delete(PlaidItem).where(PlaidItem.item_id == "item-hook"))
+        db.commit()
+    engine.dispose()